@@ -2,7 +2,7 @@ import sqlite3
 import csv
 import shutil
 import re
-import requests
+import http_session
 from bs4 import BeautifulSoup
 import os
 import json
@@ -120,7 +120,7 @@ class MM5Migrator:
         try:
             print(f"Scraping IMDB: {url}")
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_session.get(url, headers=headers, timeout=10)
             if response.status_code != 200:
                 print(f"Failed to fetch {url}: {response.status_code}")
                 return ""
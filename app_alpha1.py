@@ -2,7 +2,7 @@ import os
 import yt_dlp
 import discogs_client
 import lyricsgenius
-import requests
+import http_session
 from mutagen.easyid3 import EasyID3
 from mutagen.id3 import ID3, APIC, USLT
 from rapidfuzz import process
@@ -69,7 +69,7 @@ def tag_mp3(filepath, release):
         # Fetch and embed cover
         if release.images:
             img_url = release.images[0]['uri']
-            img_data = requests.get(img_url).content
+            img_data = http_session.get(img_url).content
             id3.add(APIC(
                 encoding=3, mime="image/jpeg", type=3, desc=u"Cover",
                 data=img_data
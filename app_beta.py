@@ -3,6 +3,8 @@ import yt_dlp
 import discogs_client
 import lyricsgenius
 import requests
+import http_session
+from yt_description import parse_description as parse_youtube_description
 from mutagen.id3 import ID3, APIC, TOAL, TSRC, TALB, TPE1, TPE2, TIT2, TCON, TDRC, TPUB, TDOR, COMM, TCOM, USLT
 from rapidfuzz import fuzz, process
 import configparser
@@ -192,57 +194,6 @@ def clean_title(title: str) -> str:
 
     return title.strip()
 
-# --- YT description ---
-def parse_youtube_description(description: str):
-    data = {}
-
-    # ℗ year + publisher
-    m = re.search(r"℗\s*(\d{4})?\s*(.+)", description)
-    if m:
-        if m.group(1):  # year exists
-            data["year"] = m.group(1)
-        new_publisher = m.group(2).strip()
-        if "publisher" in data:
-            if new_publisher != data["publisher"]:
-                data["publisher"] = f"{data['publisher']}; {new_publisher}"
-        else:
-            data["publisher"] = new_publisher
-
-    # Publisher/label line
-    m = re.search(r"Provided to YouTube by (.+)", description, re.IGNORECASE)
-    if m:
-        new_publisher = m.group(1).strip()
-        if "publisher" in data:
-            if new_publisher != data["publisher"]:
-                data["publisher"] = f"{data['publisher']}; {new_publisher}"
-        else:
-            data["publisher"] = new_publisher
-
-    # Title + artist line (split by "·")
-    m = re.search(r"(.+?) · (.+)", description)
-    if m:
-        data["title"] = m.group(1).strip()
-        normalized_uploader = m.group(2).replace(" · ", "; ")
-        data["uploader"] = normalized_uploader.strip()
-
-    # Released on: YYYY-MM-DD
-    m = re.search(r"Released on:\s*([0-9]{4}-[0-9]{2}-[0-9]{2})", description, re.IGNORECASE)
-    if m:
-        data["upload_date"] = m.group(1)  # exact release date
-
-    # Composer(s) — can appear multiple times
-    composers = re.findall(r"Composer:\s*(.+)", description, re.IGNORECASE)
-    if composers:
-        # Join multiple composers with "; " (like Discogs style)
-        data["composer"] = "; ".join(c.strip() for c in composers)
-
-    # Lyrics: everything after "lyrics:"
-    m = re.search(r"lyrics[:\-\n]+(.+)", description, re.IGNORECASE | re.DOTALL)
-    if m:
-        data["lyrics"] = m.group(1).strip()
-
-    return data
-
 # --- YT metadata ---
 def get_yt_metadata(url: str):
     ydl_opts = {"skip_download": True, "quiet": True, "no_warnings": True}
@@ -270,7 +221,7 @@ def fetch_and_crop_cover(thumbnails):
             continue
 
         try:
-            resp = requests.get(url, timeout=5)
+            resp = http_session.get(url, timeout=5)
             resp.raise_for_status()
             img_data = resp.content
             if not img_data or not isinstance(img_data, (bytes, bytearray)):
@@ -589,7 +540,7 @@ def tag_mp3_with_discogs(file: str, release):
                                       "AppleWebKit/537.36 (KHTML, like Gecko) "
                                       "Chrome/116.0.0.0 Safari/537.36"
                     }
-                    response = requests.get(img_url, headers=headers)
+                    response = http_session.get(img_url, headers=headers)
                     if response.headers.get("content-type", "").startswith("image/"):
                         img_data = response.content
                         mime_type = response.headers["content-type"]
@@ -0,0 +1,110 @@
+import os
+import io
+import time
+import shutil
+import tempfile
+import argparse
+from mutagen.id3 import ID3, APIC, TIT2, TPE1, TPE2, TALB, TDRC, TOAL, USLT
+from id3_reader import read_frames
+from tag import TagSnapshot, get_metadata_tags
+
+# A few MPEG frame headers so the files look like audio after the tag
+FAKE_AUDIO = b"\xff\xfb\x90\x00" + b"\x00" * 413
+
+
+class CountingReader(io.FileIO):
+    """File object that counts the bytes actually read."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        CountingReader.bytes_read += len(data)
+        return data
+
+    def readinto(self, b):
+        n = super().readinto(b)
+        CountingReader.bytes_read += n or 0
+        return n
+
+
+def make_corpus(folder: str, count: int, cover_mb: float):
+    cover = os.urandom(int(cover_mb * 1024 * 1024))
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"{i:04d}.mp3")
+        with open(path, "wb") as f:
+            f.write(FAKE_AUDIO * 200)
+        tags = ID3()
+        tags.add(TIT2(encoding=3, text=f"Song {i}"))
+        tags.add(TPE1(encoding=3, text="Artist"))
+        tags.add(TPE2(encoding=3, text="Artist"))
+        tags.add(TALB(encoding=3, text="Album"))
+        tags.add(TDRC(encoding=3, text="2005"))
+        # cover first, like most Discogs-tagged files, so the reader has to skip it
+        tags.add(APIC(encoding=3, mime="image/jpeg", type=3, desc="Cover", data=cover))
+        tags.add(TOAL(encoding=3, text=f"https://www.discogs.com/release/{i}"))
+        if i % 2:
+            tags.add(USLT(encoding=3, lang="eng", desc="", text=f"la la la {i}"))
+        tags.save(path, v2_version=3)
+        paths.append(path)
+    return paths
+
+
+def bench(label, paths, fn, repeat):
+    CountingReader.bytes_read = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            fn(path)
+    elapsed = time.perf_counter() - start
+    calls = len(paths) * repeat
+    print(f"{label:<28} {calls / elapsed:10.0f} files/s  {elapsed / calls * 1e6:9.1f} µs/file  "
+          f"{CountingReader.bytes_read / calls / 1024:10.1f} KiB read/file")
+
+
+def mutagen_lyrics(path):
+    with CountingReader(path, "r") as f:
+        tags = ID3(f)
+    return any(frame.text.strip() for frame in tags.getall("USLT"))
+
+
+def fast_lyrics(path):
+    with CountingReader(path, "r") as f:
+        frames = read_frames(f, ("USLT",))
+    return any(text.strip() for text in frames.get("USLT", []))
+
+
+def fast_discogs(path):
+    with CountingReader(path, "r") as f:
+        frames = read_frames(f, ("TOAL",), first_only=True)
+    return frames.get("TOAL", [None])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare id3_reader.read_frames with mutagen.id3.ID3")
+    parser.add_argument("--files", type=int, default=50, help="Number of generated MP3s")
+    parser.add_argument("--cover-mb", type=float, default=3.0, help="Embedded cover size in MB")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the corpus")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="id3bench_")
+    try:
+        paths = make_corpus(folder, args.files, args.cover_mb)
+        # sanity check: both readers agree
+        for path in paths:
+            assert mutagen_lyrics(path) == fast_lyrics(path), path
+            assert str(ID3(path)["TOAL"]) == fast_discogs(path), path
+            # saved as v2.3, so the year is in TYER: the fast path must find it like mutagen's TDRC
+            assert get_metadata_tags(path) == TagSnapshot(path).metadata_tags(), path
+
+        print(f"🎵 {args.files} files, {args.cover_mb} MB cover each, {args.repeat} passes\n")
+        bench("mutagen ID3 (has lyrics)", paths, mutagen_lyrics, args.repeat)
+        bench("read_frames USLT", paths, fast_lyrics, args.repeat)
+        bench("read_frames TOAL first_only", paths, fast_discogs, args.repeat)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import builtins
+import tempfile
+import argparse
+import resource
+import subprocess
+import contextlib
+import urllib.request
+from mutagen.id3 import ID3, APIC, TIT2, TPE1, TPE2, TALB, TDRC, TRCK
+from standin_server import build_catalog, point_clients_at, write_release_dump
+from utils import safe_filename
+from http_session import host_stats
+
+# End-to-end throughput benchmark for genius_tagger and tag_dir_with_discogs.
+# Starts standin_server.py in a subprocess, generates an MP3 corpus that
+# matches its catalog, runs the taggers against it and reports files/sec,
+# API calls per file, bytes read/written and peak RSS.
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKE_AUDIO = b"\xff\xfb\x90\x00" + b"\x00" * 413
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_corpus(folder: str, catalog: dict, cover_kb: int, frames: int):
+    """One folder per album, tagged like a ripped library (no lyrics, no Discogs URL yet)."""
+    cover = os.urandom(cover_kb * 1024)
+    paths = []
+    # the first release of every album is the canonical one; the rest are decoy editions
+    seen_masters = set()
+    for release in catalog["releases"]:
+        if release["master_id"] in seen_masters:
+            continue
+        seen_masters.add(release["master_id"])
+        album_dir = os.path.join(folder, safe_filename(release["artist"]), safe_filename(f"({release['year']}) {release['title']}"))
+        os.makedirs(album_dir, exist_ok=True)
+        for track in release["tracklist"]:
+            path = os.path.join(album_dir, safe_filename(f"{int(track['position']):02d} - {track['title']}.mp3"))
+            with open(path, "wb") as f:
+                f.write(FAKE_AUDIO * frames)
+            tags = ID3()
+            tags.add(TIT2(encoding=3, text=track["title"]))
+            tags.add(TPE1(encoding=3, text=release["artist"]))
+            tags.add(TPE2(encoding=3, text=release["artist"]))
+            tags.add(TALB(encoding=3, text=release["title"]))
+            tags.add(TDRC(encoding=3, text=str(release["year"])))
+            tags.add(TRCK(encoding=3, text=track["position"]))
+            if cover_kb:
+                tags.add(APIC(encoding=3, mime="image/jpeg", type=3, desc="Cover", data=cover))
+            tags.save(path, v2_version=3)
+            paths.append(path)
+    return paths
+
+
+def io_counters():
+    """(bytes read, bytes written) by this process so far, from /proc/self/io when available."""
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def server_stats(base_url: str, reset: bool = False) -> dict:
+    with urllib.request.urlopen(f"{base_url}/_stats{'?reset=1' if reset else ''}") as resp:
+        return json.loads(resp.read())
+
+
+def auto_input(prompt: str = "") -> str:
+    """Answers the taggers' prompts: accept the proposed query, pick the top candidate."""
+    return "1" if prompt.strip().startswith("Choose") else ""
+
+
+def measure(label: str, base_url: str, file_count: int, run):
+    server_stats(base_url, reset=True)
+    host_stats.reset()
+    read_before, written_before = io_counters()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        run()
+    elapsed = time.perf_counter() - start
+    read_after, written_after = io_counters()
+    stats = server_stats(base_url)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    api_calls = sum(v for k, v in stats.items() if k.endswith("_total"))
+    print(f"\n📊 {label}")
+    print(f"   files/sec        {file_count / elapsed:8.2f}  ({file_count} files in {elapsed:.1f}s)")
+    print(f"   API calls/file   {api_calls / file_count:8.2f}  {dict(sorted((k, v) for k, v in stats.items() if not k.endswith('_total')))}")
+    if stats.get("discogs_search"):
+        discogs_calls = sum(v for k, v in stats.items() if k.startswith("discogs_") and not k.endswith(("_total", "_429")))
+        print(f"   Discogs req/search {discogs_calls / stats['discogs_search']:6.2f}")
+    if read_before is not None:
+        print(f"   bytes read       {(read_after - read_before) / 1024 / 1024:8.1f} MiB")
+        print(f"   bytes written    {(written_after - written_before) / 1024 / 1024:8.1f} MiB")
+    for host, row in host_stats.snapshot().items():
+        print(f"   HTTP {host}  {row['requests']} requests, {row['mean_ms']:.1f} ms mean, {row['max_ms']:.0f} ms max, {row['retries']} retries")
+    print(f"   peak RSS         {peak_kb / 1024:8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end Genius/Discogs tagger benchmark against a local stand-in server")
+    parser.add_argument("--albums", type=int, default=5)
+    parser.add_argument("--tracks", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.15, help="Seconds added to every stand-in request")
+    parser.add_argument("--genius-rate", type=int, default=0, help="Genius requests per minute (0 = unlimited)")
+    parser.add_argument("--discogs-rate", type=int, default=0, help="Discogs requests per minute (0 = unlimited)")
+    parser.add_argument("--cover-kb", type=int, default=500, help="Embedded cover size in the generated MP3s")
+    parser.add_argument("--frames", type=int, default=500, help="Fake MPEG frames per file (~417 bytes each)")
+    parser.add_argument("--workers", type=int, default=6, help="genius_tagger lookup workers")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per tagger; later runs show warm-cache behaviour")
+    parser.add_argument("--reset-corpus", action="store_true", help="Regenerate the untagged corpus before every run (caches are kept)")
+    parser.add_argument("--batch", action="store_true", help="Run the Discogs tagger unattended (no prompts, review queue)")
+    parser.add_argument("--dump", action="store_true", help="Import the catalog as a local Discogs data dump first (offline matching)")
+    parser.add_argument("--skip-genius", action="store_true")
+    parser.add_argument("--skip-discogs", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary work folder")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="buccaneer_bench_")
+    port = free_port()
+    server = subprocess.Popen([
+        sys.executable, os.path.join(REPO_DIR, "standin_server.py"), "--port", str(port),
+        "--latency", str(args.latency), "--genius-rate", str(args.genius_rate),
+        "--discogs-rate", str(args.discogs_rate), "--albums", str(args.albums),
+        "--tracks", str(args.tracks), "--seed", str(args.seed),
+    ], stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        for _ in range(50):
+            try:
+                server_stats(base_url)
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        catalog = build_catalog(args.albums, args.tracks, args.seed)
+        music = os.path.join(workdir, "music")
+        files = make_corpus(music, catalog, args.cover_kb, args.frames)
+        print(f"🎵 {len(files)} files in {args.albums} albums, stand-in at {base_url} "
+              f"(latency {args.latency}s, Genius {args.genius_rate or '∞'}/min, Discogs {args.discogs_rate or '∞'}/min)")
+
+        # The taggers read secrets.ini and keep their state files in the working directory
+        with open(os.path.join(workdir, "secrets.ini"), "w", encoding="utf-8") as f:
+            f.write("[API]\nkey = bench\ngenius_key = bench\n\n[APP]\nappname = BuccaneerBench\nversion = 1.0\n")
+        os.chdir(workdir)
+        sys.path.insert(0, REPO_DIR)
+
+        if args.dump:
+            from discogs_dump import DumpStore
+            write_release_dump(catalog, "releases_dump.xml")
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+                DumpStore().import_dump("releases_dump.xml")
+
+        import genius
+        import discogs
+        import discogs_tagger
+        point_clients_at(base_url, genius.genius, (discogs.d, discogs_tagger.d))
+        builtins.input = auto_input
+
+        for run in range(1, args.runs + 1):
+            if args.reset_corpus and run > 1:
+                make_corpus(music, catalog, args.cover_kb, args.frames)
+            if not args.skip_genius:
+                measure(f"genius_tagger (run {run}, {args.workers} workers)", base_url, len(files),
+                        lambda: [None for _ in genius.genius_tagger(music, args.workers)])
+            if not args.skip_discogs:
+                if args.reset_corpus and run > 1 and not args.skip_genius:
+                    make_corpus(music, catalog, args.cover_kb, args.frames)
+                measure(f"tag_dir_with_discogs (run {run}, albums mode{', batch' if args.batch else ''})", base_url, len(files),
+                        lambda: discogs_tagger.tag_dir_with_discogs(music, "y", "a", batch=args.batch))
+                if args.batch:
+                    print(f"   review queue     {len(discogs_tagger.review_queue.pending()):8d} pending")
+    finally:
+        server.terminate()
+        server.wait()
+        if args.keep:
+            print(f"\n📂 Work folder kept at {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
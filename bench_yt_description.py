@@ -0,0 +1,89 @@
+import re
+import json
+import time
+import argparse
+from yt_description import parse_description
+
+FIXTURES = "fixtures/yt_descriptions.json"
+
+
+def legacy_parse(description: str):
+    """The six independent searches yt.parse_youtube_description used to run, for comparison."""
+    data = {}
+    m = re.search(r"℗\s*(\d{4})?\s*(.+)", description)
+    if m:
+        if m.group(1):
+            data["year"] = m.group(1)
+        data["publisher"] = m.group(2).strip()
+    m = re.search(r"Provided to YouTube by (.+)", description, re.IGNORECASE)
+    if m:
+        new_publisher = m.group(1).strip()
+        if "publisher" in data:
+            if new_publisher != data["publisher"]:
+                data["publisher"] = f"{data['publisher']}; {new_publisher}"
+        else:
+            data["publisher"] = new_publisher
+    m = re.search(r"(.+?) · (.+)", description)
+    if m:
+        data["title"] = m.group(1).strip()
+        data["uploader"] = m.group(2).replace(" · ", "; ").strip()
+    m = re.search(r"Released on:\s*([0-9]{4}-[0-9]{2}-[0-9]{2})", description, re.IGNORECASE)
+    if m:
+        data["upload_date"] = m.group(1)
+    composers = re.findall(r"Composer:\s*(.+)", description, re.IGNORECASE)
+    if composers:
+        data["composer"] = "; ".join(c.strip() for c in composers)
+    m = re.search(r"lyrics[:\-\n]+(.+)", description, re.IGNORECASE | re.DOTALL)
+    if m:
+        data["lyrics"] = m.group(1).strip()
+    return data
+
+
+def load_corpus(path: str, scale: int):
+    """The fixture descriptions, plus copies padded with `scale` extra credit/lyric lines each."""
+    with open(path, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    descriptions = [case["description"] for case in corpus]
+    if scale:
+        padding = "\n".join(f"Associated  Performer, Guitar: Session Player {i}" for i in range(scale))
+        descriptions += [d.replace("\n\nAuto-generated", f"\n{padding}\n\nAuto-generated") for d in descriptions if d]
+    return corpus, descriptions
+
+
+def bench(label, descriptions, fn, repeat):
+    size = sum(len(d.encode("utf-8")) for d in descriptions)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for description in descriptions:
+            fn(description)
+    elapsed = time.perf_counter() - start
+    calls = len(descriptions) * repeat
+    print(f"{label:<24} {calls / elapsed:10.0f} descriptions/s  {elapsed / calls * 1e6:8.1f} µs/description  "
+          f"{size * repeat / elapsed / 1024 / 1024:7.1f} MiB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark yt_description.parse_description on the fixture corpus")
+    parser.add_argument("--fixtures", type=str, default=FIXTURES, help="JSON list of {name, description, expected}")
+    parser.add_argument("--repeat", type=int, default=2000, help="Passes over the corpus")
+    parser.add_argument("--scale", type=int, default=0, help="Also time copies with this many extra credit lines")
+    args = parser.parse_args()
+
+    corpus, descriptions = load_corpus(args.fixtures, args.scale)
+
+    # the corpus doubles as the correctness check
+    for case in corpus:
+        got = parse_description(case["description"])
+        assert got == case["expected"], f"{case['name']}: {got} != {case['expected']}"
+        old = legacy_parse(case["description"])
+        changed = sorted(k for k in set(got) | set(old) if got.get(k) != old.get(k))
+        if changed:
+            print(f"ℹ️ {case['name']}: differs from the old regexes in {', '.join(changed)}")
+
+    print(f"\n📝 {len(descriptions)} descriptions, {args.repeat} passes\n")
+    bench("old: six searches", descriptions, legacy_parse, args.repeat)
+    bench("parse_description", descriptions, parse_description, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import http_session
+
+COVER_DB = "cover_cache.db"
+# Total size of original + processed images kept before the least recently used are evicted
+MAX_BYTES = 256 * 1024 * 1024
+# Concurrent image downloads, shared by every caller in the process
+DOWNLOAD_WORKERS = 4
+# (connect, read) timeouts for a single download
+TIMEOUT = (5, 20)
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+ORIGINAL = "original"
+
+
+class CoverCache:
+    """
+    Content-addressed cover art store.
+
+    URLs map to the SHA-1 of the bytes they returned; blobs are stored once per
+    (hash, variant), where "original" is the downloaded image and any other
+    variant is a processed version (e.g. a 720px square crop). Least recently
+    used blobs are evicted once the total size passes max_bytes.
+
+    Downloads run on a small shared pool with timeouts, and concurrent requests
+    for the same URL wait on a single download, so an album (or a re-tag of a
+    whole folder) fetches each image at most once.
+    """
+
+    def __init__(self, db_path: str = COVER_DB, max_bytes: int = MAX_BYTES, workers: int = DOWNLOAD_WORKERS):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.workers = workers
+        # re-entrant: a download that finishes instantly runs its done-callback while submit still holds the lock
+        self.lock = threading.RLock()
+        self.conn = None
+        self.pool = None
+        self.inflight = {}
+
+    def _db(self) -> sqlite3.Connection:
+        # opened on first use so importing the module doesn't create the file
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    hash TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    mime TEXT,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (hash, variant)
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs (last_used)")
+            self.conn.commit()
+        return self.conn
+
+    def _lookup(self, digest: str, variant: str):
+        """(data, mime) for a stored blob, bumping its LRU timestamp; None if missing."""
+        with self.lock:
+            db = self._db()
+            row = db.execute("SELECT data, mime FROM blobs WHERE hash = ? AND variant = ?", (digest, variant)).fetchone()
+            if row:
+                with db:
+                    db.execute("UPDATE blobs SET last_used = ? WHERE hash = ? AND variant = ?", (time.time(), digest, variant))
+        return (bytes(row[0]), row[1]) if row else None
+
+    def _url_hash(self, url: str):
+        with self.lock:
+            row = self._db().execute("SELECT hash FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def _store(self, digest: str, variant: str, data: bytes, mime: str, url: str = None):
+        with self.lock:
+            db = self._db()
+            with db:
+                if url:
+                    db.execute("INSERT OR REPLACE INTO urls (url, hash) VALUES (?, ?)", (url, digest))
+                db.execute(
+                    "INSERT OR REPLACE INTO blobs (hash, variant, mime, data, size, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, variant, mime, data, len(data), time.time())
+                )
+                self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for digest, variant, size in db.execute("SELECT hash, variant, size FROM blobs ORDER BY last_used").fetchall():
+            db.execute("DELETE FROM blobs WHERE hash = ? AND variant = ?", (digest, variant))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        db.execute("DELETE FROM urls WHERE hash NOT IN (SELECT hash FROM blobs WHERE variant = ?)", (ORIGINAL,))
+
+    def _download(self, url: str, headers: dict):
+        response = http_session.get(url, headers=headers or HEADERS, timeout=TIMEOUT)
+        response.raise_for_status()
+        mime = response.headers.get("content-type", "").split(";")[0].strip()
+        if not response.content or not mime.startswith("image/"):
+            return None, None
+        digest = hashlib.sha1(response.content).hexdigest()
+        self._store(digest, ORIGINAL, response.content, mime, url)
+        return digest, mime
+
+    def _original(self, url: str, headers: dict = None):
+        """(hash, data, mime) of the image behind url, downloading it only on a miss."""
+        digest = self._url_hash(url)
+        if digest:
+            hit = self._lookup(digest, ORIGINAL)
+            if hit:
+                return digest, hit[0], hit[1]
+
+        with self.lock:
+            future = self.inflight.get(url)
+            if future is None:
+                if self.pool is None:
+                    self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cover")
+                future = self.pool.submit(self._download, url, headers)
+                self.inflight[url] = future
+                future.add_done_callback(lambda _: self._forget(url))
+        digest, mime = future.result()
+        if not digest:
+            return None, None, None
+        hit = self._lookup(digest, ORIGINAL)
+        return (digest, hit[0], hit[1]) if hit else (None, None, None)
+
+    def _forget(self, url: str):
+        with self.lock:
+            self.inflight.pop(url, None)
+
+    def fetch(self, url: str, headers: dict = None):
+        """
+        The image at url as (data, mime_type), or (None, None) if the response
+        wasn't an image. Raises requests.RequestException on network errors.
+        """
+        _, data, mime = self._original(url, headers)
+        return data, mime
+
+    def cached(self, url: str, variant: str = ORIGINAL):
+        """(data, mime_type) if url's image (or its variant) is already stored, else None. Never downloads."""
+        digest = self._url_hash(url)
+        return self._lookup(digest, variant) if digest else None
+
+    def processed(self, url: str, variant: str, process, headers: dict = None):
+        """
+        process(data) -> (data, mime_type) applied to the image at url, cached
+        by content hash so the same picture is processed once whatever URL it
+        came from.
+        """
+        digest, data, mime = self._original(url, headers)
+        if not digest:
+            return None, None
+        hit = self._lookup(digest, variant)
+        if hit:
+            return hit
+        out, out_mime = process(data)
+        if out:
+            self._store(digest, variant, out, out_mime)
+        return out, out_mime
+
+
+cover_cache = CoverCache()
@@ -1,7 +1,11 @@
 import configparser
 import discogs_client
-from rapidfuzz import fuzz
+import scoring
 from utils import strip_feat
+from discogs_cache import ReleaseCache
+from discogs_ratelimit import ThrottledFetcher
+from discogs_dump import open_dump
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- CONFIG ---
 config = configparser.ConfigParser()
@@ -11,126 +15,227 @@ appname = config['APP']['appname']
 version = config['APP']['version']
 app = appname + "/" + version
 
+# Candidates scoring below this (0-100) are never shown or fetched
+MIN_SCORE = 40
+# Parallel release/master detail fetches for the candidate table
+DETAIL_WORKERS = 4
+
 # Init clients
 d = discogs_client.Client(app, user_token=discogs_api_key)
-
-# --- Search Discogs ---
-def search_discogs(query: str, max_results: int = 15, top_n: int = 5):
-    print(f"🔍 Searching Discogs with query: {query}")
-
-
+# Every request waits on a token bucket kept in step with X-Discogs-Ratelimit-Remaining
+d._fetcher = ThrottledFetcher(discogs_api_key)
+# Local copy of the Discogs data dump, if one was imported with discogs_dump.py
+dump_store = open_dump()
+# Release/master JSON persisted locally; set release_cache.ttl (seconds) to expire entries
+release_cache = ReleaseCache(d, dump=dump_store)
+
+# --- Release details for the candidate table ---
+def release_details(release_id):
+    """(released, labels, country, formats) strings for one search candidate."""
+    # fetch full release details
+    full_release = release_cache.release(release_id)
+
+    # Labels
+    labels_list = []
+    for l in getattr(full_release, "labels", []):
+          if isinstance(l, dict):
+            labels_list.append(l.get("name", "Unknown"))
+          else:
+            labels_list.append(getattr(l, "name", "Unknown"))
+    labels = ", ".join(labels_list)
+
+    # Formats
+    formats_list = []
+    for f in getattr(full_release, "formats", []):
+        fmt_name = getattr(f, "name", f.get("name", "Unknown") if isinstance(f, dict) else "Unknown")
+        descs = getattr(f, "descriptions", f.get("descriptions", []) if isinstance(f, dict) else [])
+        formats_list.append(f"{fmt_name} ({', '.join(descs)})" if descs else fmt_name)
+    formats = ", ".join(formats_list)
+
+    country = getattr(full_release, "country", "Unknown")
+    released = (
+            getattr(full_release, "released", None)
+            or full_release.data.get("released")
+            or full_release.data.get("released_formatted")
+    )
+    if not released and getattr(full_release, "master_id", None):
+        try:
+            master = release_cache.master(full_release.master_id)
+            released = getattr(master, "released", None)
+        except Exception:
+            pass
+
+    # Step 3: fallback to year
+    if not released:
+        released = str(getattr(full_release, "year", "Unknown"))
+
+    return released, labels, country, formats
+
+# --- Candidate sources ---
+def api_candidates(query: str, max_results: int = 15):
+    """
+    [("Artists - Title", release_id), ...] from the Discogs search API.
+    Pages are requested max_results at a time and only until enough unique
+    releases are collected, and everything is read from the search payload
+    ("title" is already "Artists - Title"), so no result is lazily loaded.
+    """
     results = d.search(query, type="release")
-
-    if not results:
-            print(f"⚠️ No Discogs results for query: {query}")
-            return None
+    results.per_page = max_results
 
     # Build candidate list with deduplication
     candidates = []
     seen_ids = set()
-    for i, r in enumerate(results):
-        if i >= max_results:
-            break
-        if r.id in seen_ids:
-            continue
-        seen_ids.add(r.id)
-        artist_names = []
-        for a in getattr(r, "artists", []):
-            if isinstance(a, dict):
-                artist_names.append(a.get("name", "Unknown"))
-            else:
-                artist_names.append(getattr(a, "name", "Unknown"))
-        artist_names = ", ".join(artist_names)
-
-        candidate_title = f"{artist_names} - {r.title}"
-        candidates.append((candidate_title, r))
+    page = 1
+    # .pages loads page 1 together with the pagination info (one request)
+    while len(candidates) < max_results and page <= results.pages:
+        for r in results.page(page):
+            if len(candidates) >= max_results:
+                break
+            if r.id in seen_ids:
+                continue
+            seen_ids.add(r.id)
+            candidates.append((r.data.get("title", ""), r.id))
+        page += 1
 
     if not candidates:
-        print("⚠️ No unique candidates found")
-        return None
-
-    # Compute fuzzy scores
-    scored = []
-    for title, release in candidates:
-        score = fuzz.token_sort_ratio(query, title)
-        scored.append((score, title, release))
+        print(f"⚠️ No Discogs results for query: {query}")
+    return candidates
+
+def dump_candidates(query: str):
+    """[("Artists - Title", release_id), ...] from the local dump's full-text index; no network."""
+    hits = dump_store.search(query)
+    if hits:
+        print(f"🗄️ {len(hits)} matches in the local Discogs dump")
+    else:
+        print("🗄️ No match in the local Discogs dump, asking the API")
+    return [(title, release_id) for release_id, title in hits]
 
-    scored.sort(key=lambda x: x[0], reverse=True)
+# --- Search Discogs ---
+def discogs_candidates(query: str, max_results: int = 15, top_n: int = 5, min_score: float = MIN_SCORE, on_row=None):
+    """
+    Search Discogs and return up to top_n candidates scoring min_score or more,
+    best first, each with its table details already fetched:
+    {"rank", "score", "title", "release_id", "released", "labels", "country", "formats"}.
+    on_row(candidate) is called as each candidate's details arrive.
+    Returns [] when nothing qualifies; never prompts.
+    """
+    candidates = dump_candidates(query) if dump_store else []
+    if not candidates:
+        candidates = api_candidates(query, max_results)
+    if not candidates:
+        return []
+
+    # Compute fuzzy scores (all candidates in one pass)
+    ranked = scoring.rank([query], [title for title, _ in candidates])
+    scored = [(score, *candidates[i]) for score, i in ranked]
+
+    # Drop weak candidates before spending any requests on them
+    scored = [row for row in scored if row[0] >= min_score][:top_n]
+    if not scored:
+        print(f"⚠️ No candidates scored {min_score}% or more for query: {query}")
+        return []
+
+    # Fetch details for the kept candidates in parallel
+    rows = [None] * len(scored)
+    with ThreadPoolExecutor(max_workers=min(DETAIL_WORKERS, len(scored))) as pool:
+        futures = {pool.submit(release_details, release_id): idx for idx, (_, _, release_id) in enumerate(scored)}
+        for future in as_completed(futures):
+            idx = futures[future]
+            score, title, release_id = scored[idx]
+            try:
+                released, labels, country, formats = future.result()
+            except Exception as e:
+                print(f"⚠️ Could not fetch full release {release_id}: {e}")
+                continue
+            rows[idx] = {
+                "rank": idx + 1, "score": round(score, 2), "title": title, "release_id": release_id,
+                "released": released, "labels": labels, "country": country, "formats": formats,
+            }
+            if on_row:
+                on_row(rows[idx])
+    return [row for row in rows if row]
+
+
+def format_candidate(row: dict) -> str:
+    return (f"{row['rank']}. {row['title']}, {row['released']}, {row['labels']}, "
+            f"{row['country']}, {row['formats']} - {row['score']:.2f}%")
+
+
+def search_discogs(query: str, max_results: int = 15, top_n: int = 5, min_score: float = MIN_SCORE, prefetched=None):
+    """
+    Show the candidate table for query and prompt for a release.
+    `prefetched` is an optional future of discogs_candidates(query) started
+    earlier, so the table appears without waiting on the network.
+    """
+    print(f"🔍 Searching Discogs with query: {query}")
 
-    # Display top matches with details
-    n_display = min(top_n, len(scored))
-    print("\nTop matches:")
-    for idx in range(n_display):
-        score, title, release = scored[idx]
+    # Table rows print as soon as each candidate's details arrive
+    printed = []
+    def show(row):
+        if not printed:
+            print("\nTop matches:")
+        printed.append(row)
+        print(format_candidate(row))
 
+    scored = None
+    if prefetched is not None:
         try:
-            # fetch full release details
-            full_release = d.release(release.id)
+            scored = prefetched.result()
+            for row in scored:
+                show(row)
         except Exception as e:
-            print(f"⚠️ Could not fetch full release {release.id}: {e}")
-            continue
-
-        # Labels
-        labels_list = []
-        for l in getattr(full_release, "labels", []):
-              if isinstance(l, dict):
-                labels_list.append(l.get("name", "Unknown"))
-              else:
-                labels_list.append(getattr(l, "name", "Unknown"))
-        labels = ", ".join(labels_list)
-
-        # Formats
-        formats_list = []
-        for f in getattr(full_release, "formats", []):
-            fmt_name = getattr(f, "name", f.get("name", "Unknown") if isinstance(f, dict) else "Unknown")
-            descs = getattr(f, "descriptions", f.get("descriptions", []) if isinstance(f, dict) else [])
-            formats_list.append(f"{fmt_name} ({', '.join(descs)})" if descs else fmt_name)
-        formats = ", ".join(formats_list)
-
-        country = getattr(full_release, "country", "Unknown")
-        released = (
-                getattr(full_release, "released", None)
-                or full_release.data.get("released")
-                or full_release.data.get("released_formatted")
-        )
-        if not released and getattr(full_release, "master_id", None):
-            try:
-                master = d.master(full_release.master_id)
-                released = getattr(master, "released", None)
-            except Exception:
-                pass
-
-        # Step 3: fallback to year
-        if not released:
-            released = str(getattr(full_release, "year", "Unknown"))
-
-        print(f"{idx + 1}. {title}, {released}, {labels}, {country}, {formats} - {score:.2f}%")
+            print(f"⚠️ Prefetched Discogs search failed, searching again: {e}")
+    if scored is None:
+        scored = discogs_candidates(query, max_results, top_n, min_score, on_row=show)
+    if not scored:
+        return None
 
     # Skip choice if only one release
     # if len(scored) == 1:
-    #     selected_release = scored[0][2]
-    #     print(f"✅ Only one match, automatically selected: {scored[0][1]}")
+    #     selected_release = scored[0]
+    #     print(f"✅ Only one match, automatically selected: {scored[0]['title']}")
     #     return selected_release
 
     # Otherwise ask user
+    chosen = choose_candidate(scored)
+    if chosen is None:
+        print("⏭️ Skipping Discogs tagging.")
+        return None
+    return select_release(chosen)
+
+
+def choose_candidate(scored: list):
+    """Prompt for one of the shown candidates by rank; None means skip."""
+    ranks = {row["rank"]: row for row in scored}
+    top = max(ranks)
     while True:
-        choice = input(f"Choose a release [1-{min(top_n, len(scored))}] or 0 to skip: ")
+        choice = input(f"Choose a release [1-{top}] or 0 to skip: ")
         if choice.isdigit():
             choice = int(choice)
-            if 0 <= choice <= min(top_n, len(scored)):
-                break
+            if choice == 0:
+                return None
+            if choice in ranks:
+                return ranks[choice]
         print("⚠️ Invalid input, try again.")
 
-    if choice == 0:
-        print("⏭️ Skipping Discogs tagging.")
-        return None
 
-    selected_release = scored[choice - 1][2]
-    print(f"✅ You selected: {scored[choice - 1][1]}")
+def select_release(row: dict):
+    """Full (cached) release for a chosen candidate row."""
+    try:
+        selected_release = release_cache.release(row["release_id"])
+    except Exception as e:
+        print(f"⚠️ Could not fetch full release {row['release_id']}: {e}")
+        selected_release = d.release(row["release_id"])
+    print(f"✅ You selected: {row['title']}")
     return selected_release
 
 
-def search_discogs_with_prompt(query: str):
+def search_discogs_with_prompt(query: str, prefetched=None):
+    """
+    Propose a cleaned query, then search and prompt for a release.
+    `prefetched` is a future of discogs_candidates(strip_feat(query)); it is
+    used when the proposed query is accepted and ignored for a custom one.
+    """
     # Strip feat./ft. for Discogs search
     cleaned_query = strip_feat(query)
 
@@ -143,6 +248,7 @@ def search_discogs_with_prompt(query: str):
         return None
     elif choice:
         cleaned_query = choice  # user override
+        prefetched = None
 
     # Continue with normal search
-    return search_discogs(cleaned_query)
\ No newline at end of file
+    return search_discogs(cleaned_query, prefetched=prefetched)
\ No newline at end of file
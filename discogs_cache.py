@@ -0,0 +1,134 @@
+import json
+import sqlite3
+import threading
+import time
+
+CACHE_DB = "discogs_cache.db"
+
+
+class CachedRelease:
+    """
+    Read-only stand-in for discogs_client.Release built from cached JSON.
+    Exposes the fields discogs.search_discogs and tag.tag_mp3_with_discogs read;
+    artists, labels, formats and images are plain dicts, as in the API payload.
+    Releases from the data dump list images without URLs; image_loader(id)
+    then fetches the API copy the first time images are read.
+    """
+
+    def __init__(self, data: dict, image_loader=None):
+        self.data = data
+        self.image_loader = image_loader
+        self.id = data.get("id")
+        self.title = data.get("title")
+        self.year = data.get("year")
+        self.country = data.get("country")
+        self.genres = data.get("genres", [])
+        self.styles = data.get("styles", [])
+        self.formats = data.get("formats", [])
+        self._images = data.get("images", [])
+        self.artists = data.get("artists", [])
+        self.labels = data.get("labels", [])
+        self.tracklist = data.get("tracklist", [])
+        self.master_id = data.get("master_id")
+        self.released = data.get("released")
+        self.url = data.get("uri")
+
+    @property
+    def images(self):
+        if self.image_loader and self._images and not any(i.get("resource_url") for i in self._images):
+            self.data = self.image_loader(self.id)
+            self._images = self.data.get("images", [])
+        self.image_loader = None
+        return self._images
+
+    def __repr__(self):
+        return f"<CachedRelease {self.id!r} {self.title!r}>"
+
+
+class CachedMaster:
+    """Read-only stand-in for discogs_client.Master built from cached JSON."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.id = data.get("id")
+        self.title = data.get("title")
+        self.year = data.get("year")
+        self.main_release = data.get("main_release")
+        self.released = data.get("released")
+
+    def __repr__(self):
+        return f"<CachedMaster {self.id!r} {self.title!r}>"
+
+
+class ReleaseCache:
+    """
+    Persistent store of Discogs release and master JSON keyed by id. Objects are
+    fetched through `client` only when missing (or older than `ttl` seconds, if
+    set), so a warm rerun makes no Discogs calls. Safe to share between threads.
+    With a discogs_dump.DumpStore, objects missing from the cache are read from
+    the local dump first and only fetched when the dump doesn't have them
+    (or, for releases, when their images are needed).
+    """
+
+    def __init__(self, client, db_path: str = CACHE_DB, ttl: float = None, dump=None):
+        self.client = client
+        self.dump = dump
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS objects (
+                kind TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (kind, id)
+            )
+        """)
+        self.conn.commit()
+
+    def _get(self, kind: str, object_id: int):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data, fetched_at FROM objects WHERE kind = ? AND id = ?", (kind, object_id)
+            ).fetchone()
+        if not row:
+            return None
+        if self.ttl is not None and time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, kind: str, data: dict):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO objects (kind, id, data, fetched_at) VALUES (?, ?, ?, ?)",
+                (kind, int(data["id"]), json.dumps(data), time.time())
+            )
+
+    def _api(self, kind: str, object_id: int) -> dict:
+        obj = self.client.release(object_id) if kind == "release" else self.client.master(object_id)
+        obj.refresh()
+        data = dict(obj.data)
+        self.put(kind, data)
+        return data
+
+    def _fetch(self, kind: str, object_id: int):
+        """(data, from_dump) for an object: cache, then local dump, then the API."""
+        data = self._get(kind, object_id)
+        if data is not None:
+            return data, False
+        if self.dump is not None:
+            data = self.dump.release(object_id) if kind == "release" else self.dump.master(object_id)
+            if data is not None:
+                return data, True
+        return self._api(kind, object_id), False
+
+    def release(self, release_id) -> CachedRelease:
+        """Like discogs_client.Client.release, but served from the store when possible."""
+        data, from_dump = self._fetch("release", int(release_id))
+        return CachedRelease(data, image_loader=(lambda i: self._api("release", i)) if from_dump else None)
+
+    def master(self, master_id) -> CachedMaster:
+        """Like discogs_client.Client.master, but served from the store when possible."""
+        return CachedMaster(self._fetch("master", int(master_id))[0])
@@ -0,0 +1,224 @@
+import os
+import re
+import gzip
+import json
+import zlib
+import sqlite3
+import argparse
+import threading
+import xml.etree.ElementTree as ET
+from tqdm import tqdm
+
+DUMP_DB = "discogs_dump.db"
+# Rows written per transaction while importing
+BATCH = 2000
+# Full-text hits considered per query before fuzzy scoring
+SEARCH_LIMIT = 50
+
+
+# --- XML -> API-shaped dicts ---
+def _text(elem, tag):
+    child = elem.find(tag)
+    return child.text.strip() if child is not None and child.text else ""
+
+def _list(elem, path):
+    return [e.text.strip() for e in elem.findall(path) if e.text and e.text.strip()]
+
+def _artists(elem):
+    return [
+        {"id": int(_text(a, "id") or 0), "name": _text(a, "name"), "anv": _text(a, "anv"), "join": _text(a, "join")}
+        for a in elem.findall("artists/artist")
+    ]
+
+def _images(elem):
+    # Dumps list image sizes but leave the URLs blank; covers come from the API
+    return [
+        {"type": i.get("type"), "uri": i.get("uri", ""), "resource_url": i.get("uri", ""),
+         "width": int(i.get("width") or 0), "height": int(i.get("height") or 0)}
+        for i in elem.findall("images/image")
+    ]
+
+def release_from_xml(elem) -> dict:
+    """A <release> element as a dict shaped like the API's release JSON."""
+    release_id = int(elem.get("id"))
+    released = _text(elem, "released")
+    year = int(released[:4]) if released[:4].isdigit() else 0
+    master_id = _text(elem, "master_id")
+    return {
+        "id": release_id,
+        "title": _text(elem, "title"),
+        "artists": _artists(elem),
+        "labels": [{"id": int(l.get("id") or 0), "name": l.get("name", ""), "catno": l.get("catno", "")}
+                   for l in elem.findall("labels/label")],
+        "formats": [{"name": f.get("name", ""), "qty": f.get("qty", ""), "text": f.get("text", ""),
+                     "descriptions": _list(f, "descriptions/description")}
+                    for f in elem.findall("formats/format")],
+        "genres": _list(elem, "genres/genre"),
+        "styles": _list(elem, "styles/style"),
+        "country": _text(elem, "country"),
+        "released": released,
+        "year": year,
+        "master_id": int(master_id) if master_id.isdigit() else None,
+        "tracklist": [{"position": _text(t, "position"), "title": _text(t, "title"), "duration": _text(t, "duration")}
+                      for t in elem.findall("tracklist/track")],
+        "images": _images(elem),
+        "uri": f"https://www.discogs.com/release/{release_id}",
+    }
+
+def master_from_xml(elem) -> dict:
+    """A <master> element as a dict shaped like the API's master JSON."""
+    main_release = _text(elem, "main_release")
+    year = _text(elem, "year")
+    return {
+        "id": int(elem.get("id")),
+        "title": _text(elem, "title"),
+        "artists": _artists(elem),
+        "main_release": int(main_release) if main_release.isdigit() else None,
+        "year": int(year) if year.isdigit() else 0,
+        "genres": _list(elem, "genres/genre"),
+        "styles": _list(elem, "styles/style"),
+        "images": _images(elem),
+    }
+
+def artist_names(data: dict) -> str:
+    return ", ".join(a["name"] for a in data.get("artists", []) if a.get("name"))
+
+
+class DumpStore:
+    """
+    Local copy of the Discogs releases/masters dumps: compressed API-shaped JSON
+    per object plus an FTS5 index over artists, title and year.
+    """
+
+    def __init__(self, db_path: str = DUMP_DB):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS releases (id INTEGER PRIMARY KEY, master_id INTEGER, data BLOB NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS masters (id INTEGER PRIMARY KEY, data BLOB NOT NULL)")
+        self.conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS release_fts
+            USING fts5(artists, title, year, tokenize = 'unicode61 remove_diacritics 2')
+        """)
+        self.conn.commit()
+
+    # --- import ---
+    def import_dump(self, path: str) -> int:
+        """
+        Stream a releases or masters dump (.xml or .xml.gz) into the store.
+        Elements are cleared as soon as they're written, so memory stays flat
+        whatever the dump size. Returns the number of objects imported.
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        count = 0
+        rows = []
+        with opener(path, "rb") as f:
+            context = ET.iterparse(f, events=("start", "end"))
+            _, root = next(context)
+            kind = {"releases": "release", "masters": "master"}.get(root.tag)
+            if not kind:
+                raise ValueError(f"Not a Discogs releases/masters dump: <{root.tag}>")
+            with tqdm(desc=f"📥 {os.path.basename(path)}", unit=f" {kind}s") as bar:
+                for event, elem in context:
+                    if event != "end" or elem.tag != kind:
+                        continue
+                    rows.append(release_from_xml(elem) if kind == "release" else master_from_xml(elem))
+                    # drop the parsed element and its already-seen siblings
+                    root.clear()
+                    if len(rows) >= BATCH:
+                        self._write(kind, rows)
+                        count += len(rows)
+                        bar.update(len(rows))
+                        rows = []
+                if rows:
+                    self._write(kind, rows)
+                    count += len(rows)
+                    bar.update(len(rows))
+        return count
+
+    def _write(self, kind: str, rows: list):
+        with self.lock, self.conn:
+            if kind == "release":
+                ids = [(r["id"],) for r in rows]
+                self.conn.executemany("DELETE FROM release_fts WHERE rowid = ?", ids)
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO releases (id, master_id, data) VALUES (?, ?, ?)",
+                    [(r["id"], r["master_id"], zlib.compress(json.dumps(r).encode())) for r in rows]
+                )
+                self.conn.executemany(
+                    "INSERT INTO release_fts (rowid, artists, title, year) VALUES (?, ?, ?, ?)",
+                    [(r["id"], artist_names(r), r["title"], str(r["year"] or "")) for r in rows]
+                )
+            else:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO masters (id, data) VALUES (?, ?)",
+                    [(r["id"], zlib.compress(json.dumps(r).encode())) for r in rows]
+                )
+
+    # --- lookups ---
+    def _load(self, table: str, object_id):
+        with self.lock:
+            row = self.conn.execute(f"SELECT data FROM {table} WHERE id = ?", (int(object_id),)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def release(self, release_id):
+        """API-shaped release dict, or None if the dump doesn't have it."""
+        return self._load("releases", release_id)
+
+    def master(self, master_id):
+        return self._load("masters", master_id)
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> list:
+        """
+        [(release_id, "Artists - Title"), ...] best full-text matches first.
+        All words must match; if nothing does, numbers (years, volume numbers)
+        become optional, and finally any word may match.
+        """
+        words = re.findall(r"\w+", query.lower())
+        if not words:
+            return []
+        text = [w for w in words if not w.isdigit()] or words
+        attempts = [
+            " AND ".join(f'"{w}"' for w in words),
+            " AND ".join(f'"{w}"' for w in text),
+            " OR ".join(f'"{w}"' for w in words),
+        ]
+        with self.lock:
+            for match in dict.fromkeys(attempts):
+                rows = self.conn.execute(
+                    "SELECT rowid, artists, title FROM release_fts WHERE release_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (match, limit)
+                ).fetchall()
+                if rows:
+                    return [(row[0], f"{row[1]} - {row[2]}") for row in rows]
+        return []
+
+    def close(self):
+        self.conn.close()
+
+
+def open_dump(db_path: str = DUMP_DB):
+    """The local dump store if one has been imported, else None."""
+    return DumpStore(db_path) if os.path.exists(db_path) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import Discogs data dumps for offline matching")
+    parser.add_argument("--import", dest="dumps", nargs="+", metavar="DUMP",
+                        help="releases/masters dump files (.xml or .xml.gz), e.g. discogs_20250101_releases.xml.gz")
+    parser.add_argument("--db", default=DUMP_DB, help=f"Store path (default {DUMP_DB})")
+    parser.add_argument("--search", type=str, help="Try a query against the store")
+    args = parser.parse_args()
+
+    store = DumpStore(args.db)
+    for path in args.dumps or []:
+        print(f"✅ Imported {store.import_dump(path)} objects from {path}")
+    if args.search:
+        for release_id, title in store.search(args.search, limit=10):
+            print(f"{release_id}: {title}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
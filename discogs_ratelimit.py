@@ -0,0 +1,91 @@
+import threading
+import time
+import http_session
+from discogs_client.fetchers import Fetcher
+
+# Discogs allows 60 authenticated requests per minute (moving window)
+DEFAULT_PER_MINUTE = 60
+# Retries after a 429, waiting Retry-After or 4, 8, 16, 32 seconds (enough for the one-minute window to clear)
+MAX_RETRIES = 4
+MAX_WAIT = 60
+RETRY_STATUSES = tuple(s for s in http_session.RETRY_STATUSES if s != 429)
+
+
+class TokenBucket:
+    """
+    Requests-per-minute token bucket shared by every thread using a client.
+    observe() keeps it in step with Discogs' own count from the
+    X-Discogs-Ratelimit* headers, so other processes using the same token
+    (or a lower limit) slow us down too.
+    """
+
+    def __init__(self, per_minute: int = DEFAULT_PER_MINUTE):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def observe(self, limit, remaining):
+        """Apply the server's X-Discogs-Ratelimit / -Remaining values."""
+        with self.lock:
+            self._refill()
+            if limit:
+                self.capacity = limit
+                self.rate = limit / 60
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+
+    def drain(self):
+        """Forget all tokens, e.g. after a 429."""
+        with self.lock:
+            self.tokens = 0
+            self.updated = time.monotonic()
+
+
+def _header_int(headers, name):
+    try:
+        return int(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class ThrottledFetcher(Fetcher):
+    """
+    Drop-in replacement for discogs_client's UserTokenRequestsFetcher that waits
+    for a token before each request, reads the rate-limit headers from each
+    response and backs off on 429.
+    """
+
+    def __init__(self, user_token: str, bucket: TokenBucket = None):
+        self.user_token = user_token
+        self.bucket = bucket or TokenBucket()
+
+    def fetch(self, client, method, url, data=None, headers=None, json=True):
+        for attempt in range(MAX_RETRIES + 1):
+            self.bucket.acquire()
+            # 5xx and dropped connections are retried by the shared session; 429s are paced here
+            resp = http_session.request(method, url, params={"token": self.user_token}, data=data, headers=headers,
+                                        retry_statuses=RETRY_STATUSES)
+            self.bucket.observe(_header_int(resp.headers, "X-Discogs-Ratelimit"),
+                                _header_int(resp.headers, "X-Discogs-Ratelimit-Remaining"))
+            if resp.status_code != 429 or attempt == MAX_RETRIES:
+                return resp.content, resp.status_code
+            self.bucket.drain()
+            time.sleep(min(MAX_WAIT, _header_int(resp.headers, "Retry-After") or 2 ** (attempt + 2)))
@@ -0,0 +1,80 @@
+import json
+import sqlite3
+import threading
+import time
+
+REVIEW_DB = "discogs_review.db"
+
+
+class ReviewQueue:
+    """
+    Persisted queue of Discogs lookups that batch runs couldn't decide on.
+
+    Each item is one search key (album or song) with the files it covers, the
+    query used, the run's overwrite setting and the candidate rows already
+    fetched by discogs.discogs_candidates, so reviewing later needs no search.
+    """
+
+    def __init__(self, db_path: str = REVIEW_DB):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS items (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                files TEXT NOT NULL,
+                candidates TEXT NOT NULL,
+                overwrite TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                release_id INTEGER,
+                queued_at REAL NOT NULL,
+                resolved_at REAL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def _item(row) -> dict:
+        return {
+            "key": row[0], "query": row[1], "files": json.loads(row[2]), "candidates": json.loads(row[3]),
+            "overwrite": row[4], "status": row[5], "release_id": row[6], "queued_at": row[7],
+        }
+
+    def add(self, key: str, query: str, files: list, candidates: list, overwrite: str = "n"):
+        """Queue (or re-queue) a key; files from an earlier run of the same key are kept."""
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT files FROM items WHERE key = ? AND status = 'pending'", (key,)).fetchone()
+            if row:
+                files = list(dict.fromkeys(json.loads(row[0]) + list(files)))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO items (key, query, files, candidates, overwrite, status, queued_at) "
+                "VALUES (?, ?, ?, ?, ?, 'pending', ?)",
+                (key, query, json.dumps(files), json.dumps(candidates), overwrite, time.time())
+            )
+
+    def get(self, key: str):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT key, query, files, candidates, overwrite, status, release_id, queued_at FROM items WHERE key = ?", (key,)
+            ).fetchone()
+        return self._item(row) if row else None
+
+    def pending(self) -> list:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, query, files, candidates, overwrite, status, release_id, queued_at "
+                "FROM items WHERE status = 'pending' ORDER BY queued_at"
+            ).fetchall()
+        return [self._item(row) for row in rows]
+
+    def resolve(self, key: str, release_id=None):
+        """Mark a key done: tagged with release_id, or skipped when release_id is None."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE items SET status = ?, release_id = ?, resolved_at = ? WHERE key = ?",
+                ("resolved" if release_id else "skipped", int(release_id) if release_id else None, time.time(), key)
+            )
+
+    def close(self):
+        self.conn.close()
@@ -1,8 +1,13 @@
 import configparser
 import os
-from tag import tag_mp3_with_discogs, get_metadata_tags, tagged_with_discogs
+import re
+import scoring
+from tag import tag_mp3_with_discogs, get_metadata_tags, tagged_with_discogs, fetch_discogs_cover, TagSnapshot
 from utils import get_mp3_files, strip_feat
-from discogs import search_discogs_with_prompt
+from discogs import search_discogs_with_prompt, release_cache, discogs_candidates, select_release, choose_candidate, format_candidate
+from saved_searches import SavedSearches
+from discogs_review import ReviewQueue
+from http_session import host_stats
 import discogs_client as dis
 import argparse
 
@@ -16,52 +21,162 @@ version = config['APP']['version']
 d = dis.Client(appname + '/' + version, user_token=discogs_api_key)
 
 
-SAVED_SEARCHES = "saved_searches.txt"
-
-
-def is_in_saved_searches(base, review_file=SAVED_SEARCHES):
-
-    if not os.path.exists(review_file):
+# key -> release id index; saved_searches.txt is imported into it on first run
+saved_searches = SavedSearches()
+# Lookups batch runs couldn't decide on, with their candidates
+review_queue = ReviewQueue()
+# Batch mode takes the top candidate without asking when it scores at least this (0-100)
+AUTO_ACCEPT = 90
+
+
+def is_in_saved_searches(base):
+    return saved_searches.get(base)
+
+def saved_release(base: str):
+    """(found, release) for a saved search key; found is False when nothing is saved."""
+    saved_release_id = is_in_saved_searches(base)
+    if not saved_release_id:
+        return False, None
+    try:
+        release = release_cache.release(saved_release_id)
+        print(f"💾 Using cached release {saved_release_id} for {base}")
+        return True, release
+    except Exception as e:
+        print(f"⚠️ Failed to fetch cached release {saved_release_id}: {e}")
+        return True, None
+
+def lookup_release(base: str):
+    """Saved search first, otherwise ask Discogs (with prompt) and remember the choice."""
+    found, release = saved_release(base)
+    if found:
+        return release
+
+    release = search_discogs_with_prompt(base)
+    if release:
+        saved_searches.add(base, release.data["id"])
+    return release
+
+def acceptance_score(query: str, row: dict) -> float:
+    """Candidate score, ignoring the trailing " - <year>" of album keys (Discogs titles never carry it)."""
+    trimmed = re.sub(r"\s*-\s*\d{4}$", "", query)
+    return scoring.rank([query, trimmed], [row["title"]])[0][0]
+
+def auto_release(base: str, files: list, overwrite: str, auto_accept: float = AUTO_ACCEPT):
+    """
+    Unattended lookup_release: saved search first, then the top Discogs candidate
+    if it scores auto_accept or more. Anything else goes to the review queue with
+    its candidates already fetched, and None is returned.
+    A saved search whose release can't be fetched is queued too (never
+    auto-accepted, so a different top candidate can't replace the saved choice).
+    """
+    found, release = saved_release(base)
+    if release:
+        return release
+
+    query = strip_feat(base)
+    print(f"🔍 Searching Discogs with query: {query}")
+    try:
+        candidates = discogs_candidates(query)
+    except Exception as e:
+        # a batch run never stops on one lookup: queue it without candidates and move on
+        print(f"⚠️ Discogs search failed for {query}: {e}")
+        review_queue.add(base, query, files, [], overwrite)
+        print(f"📋 Queued for review: {base} (search failed)")
         return None
+    score = acceptance_score(query, candidates[0]) if candidates else 0
+    if not found and score >= auto_accept:
+        print(f"🤖 Auto-accepted {candidates[0]['title']} at {score:.2f}%")
+        release = select_release(candidates[0])
+        saved_searches.add(base, candidates[0]["release_id"])
+        return release
+
+    review_queue.add(base, query, files, candidates, overwrite)
+    print(f"📋 Queued for review: {base} ({len(candidates)} candidates)")
+    return None
 
-    with open(review_file, "r", encoding="utf-8") as f:
-        saved_searches = {line.strip() for line in f if line.strip()}
+def tag_files(files: list, release, overwrite: str):
+    """Tag files with one release, sharing a single cover download made for the first file without one."""
+    fetched = []
 
-    matching_line = next((line for line in saved_searches if line.lower().startswith(base.lower())), None)
-    if matching_line and "discogs:" in matching_line:
-        _, right = matching_line.split("discogs:", 1)
-        return right.strip()
-    return None
+    def cover():
+        if not fetched:
+            fetched.append(fetch_discogs_cover(release))
+        return fetched[0]
+
+    for file in files:
+        # parse the full tag once and reuse it for the write
+        tag_mp3_with_discogs(TagSnapshot(file), release, overwrite, cover=cover)
 
-def tag_dir_with_discogs(folder: str, overwrite: str = "n", mode: str = "a"):
+def tag_dir_with_discogs(folder: str, overwrite: str = "n", mode: str = "a", batch: bool = False, auto_accept: float = AUTO_ACCEPT):
+    """
+    Tag every untagged MP3 under folder. With batch=True nothing is asked:
+    confident matches are tagged and the rest are queued for review_pending().
+    """
     mp3_files = get_mp3_files(folder, recursive=True)
     print(f"🎵 Found {len(mp3_files)} MP3 files")
+
+    # Group files by search key before any network work, so every album
+    # (mode "a") gets one lookup, one prompt, one release fetch and one cover download
+    groups = {}
     for file in mp3_files:
-        url = tagged_with_discogs(file)
-        if not url:
-            title, artist, album, year = get_metadata_tags(file)
-            if mode == "a":
-                base = f"{strip_feat(artist)} - {strip_feat(album)} - {year}".strip().lower()
-            else:
-                base = f"{strip_feat(artist)} - {strip_feat(title)}".strip().lower()
-            is_not_in_search = True
-            saved_release_id = is_in_saved_searches(base)
-            if saved_release_id:
-                try:
-                    release = d.release(int(saved_release_id))
-                    print(f"💾 Using cached release {saved_release_id} for {base}")
-                    is_not_in_search = False
-                except Exception as e:
-                    print(f"⚠️ Failed to fetch cached release {saved_release_id}: {e}")
-                    release = None
-            else:
-                release = search_discogs_with_prompt(base)
-
-            if release and is_not_in_search:
-                discogs_release = release.data["id"]
-                with open(SAVED_SEARCHES, "a", encoding="utf-8") as out:
-                    out.write(base + " discogs:" + str(discogs_release) + "\n")
-            tag_mp3_with_discogs(file, release, overwrite)
+        if tagged_with_discogs(file):
+            continue
+        title, artist, album, year = get_metadata_tags(file)
+        if mode == "a":
+            base = f"{strip_feat(artist)} - {strip_feat(album)} - {year}".strip().lower()
+        else:
+            base = f"{strip_feat(artist)} - {strip_feat(title)}".strip().lower()
+        groups.setdefault(base, []).append(file)
+    print(f"💿 {len(groups)} distinct {'albums' if mode == 'a' else 'songs'} to look up")
+
+    queued = 0
+    for base, files in groups.items():
+        if batch:
+            release = auto_release(base, files, overwrite, auto_accept)
+            if not release:
+                queued += 1
+                continue
+        else:
+            release = lookup_release(base)
+        tag_files(files, release, overwrite)
+
+    if batch:
+        print(f"✅ {len(groups) - queued} tagged, 📋 {queued} queued for review (python discogs_tagger.py --review)")
+
+def resolve_review(key: str, release_id=None):
+    """Apply a review decision: tag the item's files with release_id, or skip it when release_id is falsy."""
+    item = review_queue.get(key)
+    if not item:
+        print(f"⚠️ Nothing queued for {key}")
+        return
+    if release_id:
+        try:
+            release = release_cache.release(release_id)
+        except Exception as e:
+            print(f"⚠️ Could not fetch full release {release_id}: {e}")
+            print(f"📋 {key} stays queued for review")
+            return
+        saved_searches.add(key, release_id)
+        tag_files([f for f in item["files"] if os.path.exists(f)], release, item["overwrite"])
+    else:
+        print(f"⏭️ Skipped {key}")
+    review_queue.resolve(key, release_id)
+
+def review_pending():
+    """Work through the review queue at the prompt, using the candidates saved by batch runs."""
+    items = review_queue.pending()
+    print(f"📋 {len(items)} queued for review")
+    for item in items:
+        print(f"\n💿 {item['key']} ({len(item['files'])} files)")
+        if item["candidates"]:
+            for row in item["candidates"]:
+                print(format_candidate(row))
+            chosen = choose_candidate(item["candidates"])
+            resolve_review(item["key"], chosen["release_id"] if chosen else None)
+        else:
+            # nothing was found automatically: let the user try another query
+            release = search_discogs_with_prompt(item["query"])
+            resolve_review(item["key"], release.data["id"] if release else None)
 
 
 def main():
@@ -69,9 +184,16 @@ def main():
     parser.add_argument("--path", type=str, help="Folder path to process")
     parser.add_argument("--overwrite", type=str, choices=["y", "n"], help="Overwrite existing tags? (y/n)")
     parser.add_argument("--mode", type=str, choices=["s", "a"], help="Mode: songs (s) or albums (a)")
+    parser.add_argument("--batch", action="store_true", help="Don't prompt: auto-accept confident matches, queue the rest for review")
+    parser.add_argument("--auto-accept", type=float, default=AUTO_ACCEPT, help=f"Batch mode score threshold (default {AUTO_ACCEPT})")
+    parser.add_argument("--review", action="store_true", help="Review items queued by batch runs")
 
     args = parser.parse_args()
 
+    if args.review:
+        review_pending()
+        return
+
     if not args.path:
         args.path = input("📂 Enter folder path: ").strip()
 
@@ -81,7 +203,8 @@ def main():
     if not args.mode:
         args.mode = input("📝 (s)ongs|(A)lbums? ").strip().lower()
 
-    tag_dir_with_discogs(args.path, args.overwrite, args.mode)
+    tag_dir_with_discogs(args.path, args.overwrite, args.mode, args.batch, args.auto_accept)
+    host_stats.report()
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,20 @@
 import os
 import platform
 import configparser
-from mutagen.id3 import ID3, USLT, ID3NoHeaderError, error
-from rapidfuzz import fuzz
+from mutagen.id3 import USLT
+import scoring
 from tqdm import tqdm
 import lyricsgenius
+import http_session
 from utils import flip_query, keep_main, get_mp3_files
-from tag import get_metadata_tags
+from tag import get_metadata_tags, TagSnapshot, load_snapshot
+from genius_state import RunState, SearchCache, STATE_DB, DAY
+from id3_reader import read_frames, UnsupportedTag
 import time
 import threading
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 if platform.system() == "Windows":
     import msvcrt
 
@@ -20,11 +25,17 @@ GENIUS_TOKEN = config['API']['genius_key']
 
 # Init Genius client
 genius = lyricsgenius.Genius(GENIUS_TOKEN, verbose=False, timeout=15)
+# pooled keep-alive connections, retries with backoff and per-host latency (keeps lyricsgenius' headers)
+genius._session = http_session.adopt(genius._session)
 genius.skip_non_songs = True
 genius.remove_section_headers = True
 
+search_cache = SearchCache()
+
 MANUAL_FILE = "manual_review.txt"
 SKIPPED_FILE = "skipped_review.txt"
+DEFAULT_WORKERS = 6
+LYRICS_DIR = "lyrics_store"
 paused = False
 should_quit = False
 
@@ -42,50 +53,68 @@ def key_listener():
                 tqdm.write("\n🛑 Quit requested.")
         time.sleep(0.1)  # 🟢 this prevents CPU thrashing
 
-def is_in_manual_review(filepath, review_file=MANUAL_FILE):
-    with open(review_file, "r", encoding="utf-8") as f:
-        # Use a set for instant lookups
-        manual_paths = {line.strip() for line in f if line.strip()}
-    return filepath in manual_paths
-
+def load_state() -> RunState:
+    """Open the run-state store, seeding it from the legacy .txt lists on first use."""
+    state = RunState(skip_ttl=search_cache.negative_ttl)
+    if state.created:
+        imported = state.import_review_file(MANUAL_FILE, "manual") + state.import_review_file(SKIPPED_FILE, "skip")
+        if imported:
+            tqdm.write(f"📥 Imported {imported} files from {MANUAL_FILE} / {SKIPPED_FILE}")
+    return state
 
 
-def has_lyrics(filepath: str) -> bool:
-    """Check if MP3 already has lyrics tag."""
-    try:
-        tags = ID3(filepath)
-        return any(
-            getattr(frame, "FrameID", "") == "USLT" and getattr(frame, "text", "").strip()
-            for frame in tags.values()
-        )
-    except (ID3NoHeaderError, error):
-        tqdm.write("\n💩 ID3 error for " + filepath + " ...skipping")
+def has_lyrics(file) -> bool:
+    """
+    Check if MP3 already has lyrics tag. `file` can be a path or a TagSnapshot;
+    paths go through the fast frame reader, which skips cover art.
+    """
+    if isinstance(file, str):
+        try:
+            frames = read_frames(file, ("USLT",))
+            if frames is None:
+                tqdm.write("\n💩 ID3 error for " + file + " ...skipping")
+                return True
+            return any(text.strip() for text in frames.get("USLT", []))
+        except UnsupportedTag:
+            pass
+    snapshot = load_snapshot(file)
+    if not snapshot.has_header:
+        tqdm.write("\n💩 ID3 error for " + snapshot.filepath + " ...skipping")
         return True
+    return snapshot.lyrics is not None
+
+def song_full_title(song: dict) -> str:
+    """Genius hit as "Title - Artist", the same shape as a flipped query."""
+    return f"{song.get('title','')} - {song.get('primary_artist',{}).get('name','')}"
 
-def search_genius(query: str):
+def search_genius(query: str, variants=(), extra_songs=()):
     """
     Search Genius and rank results by similarity score to query.
     Input `query` should be the basename, e.g. "Artist - Title".
     This function flips the query internally to "Title - Artist" for searching.
+    Hits (and empty results) come from search_cache while they're fresh.
+
+    Hits are scored against the flipped query and any extra `variants` (also
+    "Artist - Title") in one scoring.rank call, best variant wins. Songs in
+    `extra_songs` (e.g. hits of an earlier search) are merged in and ranked too.
     """
     # keep original query (Artist - Title)
     flipped = flip_query(query)  # Title - Artist
     try:
-        results = genius.search_songs(flipped)
-        hits = results.get("hits", []) if results else []
-
-        scored = []
-        for hit in hits:
-            song = hit["result"]
-            # Build comparison string in the same format we flip to:
-            full_title = f"{song.get('title','')} - {song.get('primary_artist',{}).get('name','')}"
-            # Compare flipped query vs Genius full title
-            score = fuzz.token_sort_ratio(flipped, full_title)
-            scored.append((score, song))
-
-        # ensure sorted by score desc
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return scored
+        songs = search_cache.get(flipped)
+        if songs is None:
+            results = genius.search_songs(flipped)
+            hits = results.get("hits", []) if results else []
+            songs = [hit["result"] for hit in hits]
+            search_cache.put(flipped, songs)
+
+        seen = {song.get("id") for song in songs}
+        songs = songs + [song for song in extra_songs if song.get("id") not in seen]
+
+        # Compare flipped query variants vs Genius full titles
+        queries = [flipped] + [flip_query(v) for v in variants]
+        ranked = scoring.rank(queries, [song_full_title(song) for song in songs])
+        return [(score, songs[i]) for score, i in ranked]
     except Exception as e:
         tqdm.write(f"⛔ Genius search failed for '{query}': {e}")
         return []
@@ -98,29 +127,15 @@ def choose_song(matches, query: str, min_score: int = 50, auto_threshold: int =
       - returns ("manual", filtered_list) if manual selection is needed
 
     Important: `query` is the basename "Artist - Title" (unflipped).
-    Scoring is computed against the flipped form ("Title - Artist") to match search_genius.
+    `matches` must already be ranked by search_genius (case-insensitive,
+    against the flipped form), so nothing is scored again here.
     """
     if not matches:
         return "skip", None
 
-    # Use the same flipped form as the search function for scoring
-    query_for_scoring = flip_query(query).lower()
-
-    # Recompute (case-insensitive) scores to be sure
-    scored = []
-    for _, song in matches:
-        full_title = f"{song.get('title','')} - {song.get('primary_artist',{}).get('name','')}".lower()
-        score = fuzz.token_sort_ratio(query_for_scoring, full_title)
-        scored.append((score, song))
-
-    # Sort descending
-    scored.sort(key=lambda x: x[0], reverse=True)
-
     # Filter out weak matches
-    filtered = [(s, song) for s, song in scored if s >= min_score]
+    filtered = [(s, song) for s, song in matches if s >= min_score]
     if not filtered:
-        # show best score for debugging
-        best = scored[0][0] if scored else 0
         # tqdm.write(f"⏭️ Skipping {query}")
         return "skip", None
 
@@ -134,170 +149,268 @@ def choose_song(matches, query: str, min_score: int = 50, auto_threshold: int =
     return "manual", filtered
 
 def fetch_lyrics(song):
-    """Fetch lyrics from Genius given a song dict (title & primary artist required)."""
+    """
+    Fetch lyrics for the song dict that search_genius picked, straight from its
+    Genius page (no second search). Results are kept in LYRICS_DIR keyed by
+    Genius song id; empty ones (instrumentals, but also failed scrapes) only
+    for search_cache.negative_ttl, like other misses.
+    """
+    song_id = song.get("id")
+    url = song.get("url")
+    if not (song_id or url):
+        return None
+
+    cache_path = os.path.join(LYRICS_DIR, f"{song_id}.txt") if song_id else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = f.read()
+        if cached or time.time() - os.path.getmtime(cache_path) < search_cache.negative_ttl:
+            return cached or None
+
     try:
-        # use search_song to get a Song object with .lyrics
-        title = song.get("title")
-        artist = song.get("primary_artist", {}).get("name")
-        if not (title and artist):
-            return None
-        lyrics_song = genius.search_song(title, artist)
-        if lyrics_song:
-            return lyrics_song.lyrics
+        lyrics = genius.lyrics(song_id=song_id, song_url=url, remove_section_headers=genius.remove_section_headers)
     except Exception as e:
         tqdm.write(f"⛔ Failed to fetch lyrics for {song.get('title')} - {e}")
         return "Error"
 
-def tag_with_lyrics(filepath: str, lyrics: str):
-    """Write lyrics to MP3 file (replace old USLT frames)."""
-    try:
-        tags = ID3(filepath)
-    except ID3NoHeaderError:
-        tags = ID3()
+    if cache_path:
+        os.makedirs(LYRICS_DIR, exist_ok=True)
+        # write-then-rename so concurrent workers never see a half-written file
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(lyrics or "")
+        os.replace(tmp_path, cache_path)
+    return lyrics
+
+def tag_with_lyrics(file, lyrics: str):
+    """Write lyrics to MP3 file (replace old USLT frames). `file` can be a path or a TagSnapshot."""
+    snapshot = load_snapshot(file)
 
     # Remove existing USLT frames
-    for key in list(tags.keys()):
-        if key.startswith("USLT"):
-            tags.pop(key)
+    snapshot.delall("USLT")
 
-    tags.add(USLT(encoding=3, lang="eng", desc="", text=lyrics))
-    tags.save(filepath)
-    # if lyrics != "Instrumental":
-    #    # tqdm.write(f"✅ Tagged {os.path.basename(filepath)}")
-    # else:
-    #    # tqdm.write(f"✅ Tagged {os.path.basename(filepath)} as Instrumenal")
+    snapshot.add(USLT(encoding=3, lang="eng", desc="", text=lyrics))
+    snapshot.save()
 
-def genius_tagger(folder: str):
+def lookup_file(file: str) -> dict:
+    """
+    Network half of the pipeline for one file: read its tags, search Genius
+    (with the keep_main retry) and fetch lyrics for an auto match.
+    Runs in a worker thread, so it never writes to the file.
+    """
+    if has_lyrics(file):
+        return {"decision": "haslyrics", "data": None, "base": None, "lyrics": None, "snapshot": None}
+
+    snapshot = TagSnapshot(file)
+
+    title, artist, album, year = get_metadata_tags(snapshot)
+    base = f"{artist} - {title}" if artist else title
+
+    results = search_genius(base)
+    decision, data = choose_song(results, base)
+
+    # 🔁 Retry with stripped "feat." if low score (manual trigger)
+    if decision != "auto":
+        alt_query = base
+        if base:
+            alt_query = flip_query(keep_main(flip_query(base)))
+        else:
+            tqdm.write(f"⛔ There's something wrong with the tags in {file}")
+        if alt_query != base:
+            # score the new hits and the first search's hits against both variants at once
+            results = search_genius(alt_query, variants=[base], extra_songs=[song for _, song in results])
+            decision, data = choose_song(results, alt_query)
+
+    if decision == "skip" and results:
+        # Hits that scored too low would otherwise stay cached for SEARCH_TTL, so the retry after
+        # NEGATIVE_TTL would re-score them; drop them so it searches Genius again
+        search_cache.forget(flip_query(base))
+        if alt_query != base:
+            search_cache.forget(flip_query(alt_query))
+
+    lyrics = fetch_lyrics(data) if decision == "auto" else None
+    return {"decision": decision, "data": data, "base": base, "lyrics": lyrics, "snapshot": snapshot}
 
-    """Main function to process all MP3s in a folder. Manual prompts deferred to the end."""
+def genius_tagger(folder: str, workers: int = DEFAULT_WORKERS):
+
+    """
+    Main function to process all MP3s in a folder. Manual prompts deferred to the end.
+    Up to `workers` files are looked up on Genius concurrently; tags are written
+    and progress is yielded from this generator in file order.
+    """
     pending = []
     manual_only = False
-    stats = {"auto": 0, "manual": 0, "skip": 0, "haslyrics": 0}
-
-    if os.path.isfile(folder) and folder.endswith(".txt"):
-        # Manual pass: read paths from file
-        with open(folder, "r", encoding="utf-8") as f:
-            mp3_files = [line.strip() for line in f if line.strip()]
-        tqdm.write(f"📜 Loaded {len(mp3_files)} files for manual review.")
-        manual_only = True
-    else:
-        # Normal folder run
-        mp3_files = [
-            f for f in get_mp3_files(folder, recursive=True)
-            if os.path.isfile(f) and f.lower().endswith(".mp3")
-        ]
-        tqdm.write(f"🎵 Found {len(mp3_files)} MP3 files. Use [p] to pause/resume or [q] to quit.")
-        yield 0, len(mp3_files), f"🎵 Found {len(mp3_files)} MP3 files."
-
-    with tqdm(total=len(mp3_files), desc="Searching and tagging...", unit="file", dynamic_ncols=True, colour="cyan") as pbar:
-
-        for file in mp3_files:
-
-            if should_quit:
-                break
-            while paused:
-                 time.sleep(0.1)
-            if (is_in_manual_review(file) or is_in_manual_review(file, SKIPPED_FILE)) and not manual_only:
-                pbar.colour = "white"
-                pbar.update(1)
-                message = "Skipping... not found"
-                yield (1, len(mp3_files), message)
-                continue
-            if has_lyrics(file):
-                stats["haslyrics"] += 1
-                pbar.colour = "blue"
-                pbar.update(1)
-                message = "Skipping... has lyrics"
-                yield (1, len(mp3_files), message)
-                continue
-            else:
-                title, artist, album, year = get_metadata_tags(file)
-                base = f"{artist} - {title}" if artist else title
-
-            # tqdm.write("🔍", end = "")
-            results = search_genius(base)
-            decision, data = choose_song(results, base)
-
-            # 🔁 Retry with stripped "feat." if low score (manual trigger)
-            if decision != "auto":
-                if base:
-                    alt_query = flip_query(keep_main(flip_query(base)))
-                else:
-                    pbar.colour = "red"
-                    tqdm.write(f"⛔ There's something wrong with the tags in {base}")
-               # tqdm.write(alt_query)
-                if alt_query != base:
-                    # tqdm.write("🔁", end = "")
-                    results = search_genius(alt_query)
-                    decision, data = choose_song(results, alt_query)
-
-            if decision == "auto":
-                pbar.colour = "green"
-                song = data
-                lyrics = fetch_lyrics(song)
-                if lyrics and lyrics != "Error":
-                    tag_with_lyrics(file, lyrics)
-                elif not lyrics:
+    state = load_state()
+    stats = {"auto": 0, "manual": 0, "skip": 0, "haslyrics": 0, "failed": 0}
+
+    try:
+        if os.path.isfile(folder) and folder.endswith(".txt"):
+            # Manual pass: read paths from file
+            with open(folder, "r", encoding="utf-8") as f:
+                mp3_files = [line.strip() for line in f if line.strip()]
+            tqdm.write(f"📜 Loaded {len(mp3_files)} files for manual review.")
+            manual_only = True
+        else:
+            # Normal folder run
+            mp3_files = [
+                f for f in get_mp3_files(folder, recursive=True)
+                if os.path.isfile(f) and f.lower().endswith(".mp3")
+            ]
+            tqdm.write(f"🎵 Found {len(mp3_files)} MP3 files. Use [p] to pause/resume or [q] to quit.")
+            yield 0, len(mp3_files), f"🎵 Found {len(mp3_files)} MP3 files."
+
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        in_flight = deque()
+        remaining = iter(mp3_files)
+        exhausted = False
+
+        try:
+            with tqdm(total=len(mp3_files), desc="Searching and tagging...", unit="file", dynamic_ncols=True, colour="cyan") as pbar:
+
+                while True:
+
+                    # Keep the lookup window full; results are consumed strictly in file order
+                    while not exhausted and not should_quit and not paused and len(in_flight) < max(1, workers) * 2:
+                        file = next(remaining, None)
+                        if file is None:
+                            exhausted = True
+                        elif state.is_pending_review(file) and not manual_only:
+                            in_flight.append((file, "review", None))
+                        elif state.is_done(file):
+                            in_flight.append((file, "done", None))
+                        else:
+                            in_flight.append((file, "lookup", pool.submit(lookup_file, file)))
+
+                    if should_quit:
+                        break
+                    while paused and not should_quit:
+                        time.sleep(0.1)
+                    if should_quit:
+                        break
+                    if not in_flight:
+                        if exhausted:
+                            break
+                        continue
+
+                    file, kind, future = in_flight.popleft()
+
+                    if kind == "review":
+                        pbar.colour = "white"
+                        pbar.update(1)
+                        message = "Skipping... not found"
+                        yield (1, len(mp3_files), message)
+                        continue
+                    if kind == "done":
+                        stats["haslyrics"] += 1
+                        pbar.colour = "blue"
+                        pbar.update(1)
+                        message = "Skipping... has lyrics"
+                        yield (1, len(mp3_files), message)
+                        continue
+
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # one unreadable file or failed request shouldn't end the run; it is retried next time
+                        tqdm.write(f"⛔ Lookup failed for {file} - {e}")
+                        result = {"decision": "failed", "data": None, "base": None}
+                    decision, data, base = result["decision"], result["data"], result["base"]
+
+                    if decision == "haslyrics":
+                        state.record(file, "haslyrics")
+                        stats["haslyrics"] += 1
+                        pbar.colour = "blue"
+                        pbar.update(1)
+                        message = "Skipping... has lyrics"
+                        yield (1, len(mp3_files), message)
+                        continue
+
+                    if decision == "auto":
+                        pbar.colour = "green"
+                        song = data
+                        lyrics = result["lyrics"]
+                        if lyrics and lyrics != "Error":
+                            tag_with_lyrics(result["snapshot"], lyrics)
+                        elif not lyrics:
+                            tag_with_lyrics(result["snapshot"], "Instrumental")
+                        if lyrics != "Error":
+                            state.record(file, "auto", song.get("id"))
+                        stats["auto"] += 1
+
+                    elif decision == "skip":
+                        pbar.colour = "yellow"
+                        # retried once the negative cache entry expires
+                        state.record(file, "skip")
+                        stats["skip"] += 1
+                        # already printed reason inside choose_song
+                        pass
+
+                    elif decision == "failed":
+                        pbar.colour = "red"
+                        stats["failed"] += 1
+
+                    elif decision == "manual":
+                        pbar.colour = "magenta"
+                        stats["manual"] += 1
+                        if not manual_only:
+                            with open(MANUAL_FILE, "a", encoding="utf-8") as out:
+                                out.write(file + "\n")
+                            state.record(file, "manual")
+                        else:
+                            # Defer manual review: store file path, display name, and filtered candidates
+                            pending.append((file, base, data))
+
+                   # Update progress bar and live stats
+                    pbar.update(1)
+                    message = f"Processing files |✅ {stats['auto']:03d}|🚺 {stats['manual']:03d}|⏭️ {stats['skip']:03d}|🌅 {stats['haslyrics']:03d}|"
+                    pbar.set_description(
+                        message
+                    )
+                    yield (1, len(mp3_files), message)
+        finally:
+            # Drop queued lookups on quit (or when the web client disconnects)
+            for _, _, future in in_flight:
+                if future:
+                    future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        # After loop: prompt user for pending/manual ones
+        if pending:
+            tqdm.write("\n=== Manual review for ambiguous matches ===")
+        for file, base, scored in pending:
+            if not has_lyrics(file):
+                base = flip_query(base)
+                tqdm.write(f"\n🔍 Manual review needed for: {base}")
+                for idx, (score, song) in enumerate(scored, 1):
+                    tqdm.write(f"🎧 {idx}. {song.get('title')} - {song.get('primary_artist',{}).get('name')} ({score:.1f}%)")
+
+                choice = input(f"Select a match [1–{len(scored)}], 0 for Instrumental or press Enter to skip: ").strip()
+                if choice == "0":
                     tag_with_lyrics(file, "Instrumental")
-                stats["auto"] += 1
-
-            elif decision == "skip":
-                pbar.colour = "yellow"
-                with open(SKIPPED_FILE, "a", encoding="utf-8") as out:
-                    out.write(file + "\n")
-                stats["skip"] += 1
-                # already printed reason inside choose_song
-                pass
-
-            elif decision == "manual":
-                pbar.colour = "magenta"
-                stats["manual"] += 1
-                if not manual_only:
-                    with open(MANUAL_FILE, "a", encoding="utf-8") as out:
-                        out.write(file + "\n")
+                    state.record(file, "auto")
+                elif choice.isdigit() and 1 <= int(choice) <= len(scored):
+                    song = scored[int(choice) - 1][1]
+                    lyrics = fetch_lyrics(song)
+                    if lyrics:
+                        tag_with_lyrics(file, lyrics)
+                        state.record(file, "auto", song.get("id"))
                 else:
-                    # Defer manual review: store file path, display name, and filtered candidates
-                    pending.append((file, base, data))
-
-           # Update progress bar and live stats
-            pbar.update(1)
-            message = f"Processing files |✅ {stats['auto']:03d}|🚺 {stats['manual']:03d}|⏭️ {stats['skip']:03d}|🌅 {stats['haslyrics']:03d}|"
-            pbar.set_description(
-                message
-            )
-            yield (1, len(mp3_files), message)
-    # After loop: prompt user for pending/manual ones
-    if pending:
-        tqdm.write("\n=== Manual review for ambiguous matches ===")
-    for file, base, scored in pending:
-        if not has_lyrics(file):
-            base = flip_query(base)
-            tqdm.write(f"\n🔍 Manual review needed for: {base}")
-            for idx, (score, song) in enumerate(scored, 1):
-                tqdm.write(f"🎧 {idx}. {song.get('title')} - {song.get('primary_artist',{}).get('name')} ({score:.1f}%)")
-
-            choice = input(f"Select a match [1–{len(scored)}], 0 for Instrumental or press Enter to skip: ").strip()
-            if choice == "0":
-                tag_with_lyrics(file, "Instrumental")
-            elif choice.isdigit() and 1 <= int(choice) <= len(scored):
-                song = scored[int(choice) - 1][1]
-                lyrics = fetch_lyrics(song)
-                if lyrics:
-                    tag_with_lyrics(file, lyrics)
-            else:
-                tqdm.write(f"⏭️ Skipped {base}")
-
-    # ✅ Final summary
-    summary_msg = (f"🏁 Tagging complete!\n"
-                   f"   ✅ Tagged: {stats['auto']}\n"
-                   f"   🚺 Manual review needed: {stats['manual']}\n"
-                   f"   ⏭️ Not found: {stats['skip']}\n"
-                   f"   🌅 Already has lyrics: {stats['haslyrics']}\n\n"
-                   )
-    tqdm.write(summary_msg)
-    yield 0, len(mp3_files), summary_msg
-    if stats['manual']:
-        tqdm.write(f"\n💾 Manual review list saved to: {os.path.abspath(MANUAL_FILE)}")
+                    tqdm.write(f"⏭️ Skipped {base}")
+
+        # ✅ Final summary
+        summary_msg = (f"🏁 Tagging complete!\n"
+                       f"   ✅ Tagged: {stats['auto']}\n"
+                       f"   🚺 Manual review needed: {stats['manual']}\n"
+                       f"   ⏭️ Not found: {stats['skip']}\n"
+                       f"   🌅 Already has lyrics: {stats['haslyrics']}\n"
+                       f"   ⛔ Failed: {stats['failed']}\n\n"
+                       )
+        tqdm.write(summary_msg)
+        yield 0, len(mp3_files), summary_msg
+        if stats['manual']:
+            tqdm.write(f"\n💾 Manual review list saved to: {os.path.abspath(MANUAL_FILE)}")
+    finally:
+        state.close()
 
 def main():
     if platform.system() == "Windows":
@@ -306,13 +419,27 @@ def main():
 
     parser = argparse.ArgumentParser(description="Genius CLI")
     parser.add_argument("--path", type=str, help="Folder path to process")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Files looked up on Genius concurrently (default {DEFAULT_WORKERS})")
+    parser.add_argument("--search-ttl", type=float, default=search_cache.ttl / DAY, help="Days before cached Genius search hits are refreshed")
+    parser.add_argument("--negative-ttl", type=float, default=search_cache.negative_ttl / DAY, help="Days before 'not found' searches and skipped files are retried")
+    parser.add_argument("--import-lists", action="store_true", help=f"Import {MANUAL_FILE} and {SKIPPED_FILE} into the run-state store and exit")
 
     args = parser.parse_args()
+    search_cache.ttl = args.search_ttl * DAY
+    search_cache.negative_ttl = args.negative_ttl * DAY
+
+    if args.import_lists:
+        state = RunState()
+        imported = state.import_review_file(MANUAL_FILE, "manual") + state.import_review_file(SKIPPED_FILE, "skip")
+        state.close()
+        print(f"📥 Imported {imported} files into {STATE_DB}")
+        return
 
     if not args.path:
         args.path = input("📂 Enter folder path or manual_review.txt: ").strip()
-    for step, total, message in genius_tagger(args.path):
+    for step, total, message in genius_tagger(args.path, args.workers):
         print(f"{step}/{total} {message}")
+    http_session.host_stats.report()
 
 
 if __name__ == "__main__":
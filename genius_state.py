@@ -0,0 +1,162 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+
+STATE_DB = "genius_state.db"
+
+DAY = 24 * 60 * 60
+# How long Genius search hits are trusted before searching again
+SEARCH_TTL = 30 * DAY
+# How long "not found" is trusted: empty searches and skipped files get retried after this
+NEGATIVE_TTL = 7 * DAY
+
+# Outcomes that mean the file is finished as long as it hasn't changed on disk
+DONE_OUTCOMES = ("auto", "haslyrics")
+# Outcomes that keep a file out of normal runs until it's reviewed ("skip" only until NEGATIVE_TTL runs out)
+REVIEW_OUTCOMES = ("manual", "skip")
+
+
+class RunState:
+    """
+    Persistent per-file outcome store for genius_tagger.
+
+    The whole table is loaded into memory once, so lookups during a run are
+    O(1) dict hits. Every record() is committed in its own transaction so an
+    interrupted run keeps everything it finished.
+    """
+
+    def __init__(self, db_path: str = STATE_DB, skip_ttl: float = NEGATIVE_TTL):
+        self.db_path = db_path
+        self.skip_ttl = skip_ttl
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                outcome TEXT NOT NULL,
+                song_id INTEGER,
+                size INTEGER,
+                mtime REAL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+        self.entries = {
+            row[0]: {"outcome": row[1], "song_id": row[2], "size": row[3], "mtime": row[4], "updated_at": row[5]}
+            for row in self.conn.execute("SELECT path, outcome, song_id, size, mtime, updated_at FROM files")
+        }
+        # "first use" is an empty files table, not a missing file: SearchCache shares the db and may have created it
+        self.created = not self.entries
+
+    def get(self, filepath: str):
+        return self.entries.get(filepath)
+
+    def is_done(self, filepath: str) -> bool:
+        """True if the file was tagged (or already had lyrics) and is unchanged since."""
+        entry = self.entries.get(filepath)
+        if not entry or entry["outcome"] not in DONE_OUTCOMES:
+            return False
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return False
+        return entry["size"] == st.st_size and entry["mtime"] == st.st_mtime
+
+    def is_pending_review(self, filepath: str) -> bool:
+        """True for files waiting on manual review, or skipped (not found) less than skip_ttl ago."""
+        entry = self.entries.get(filepath)
+        if not entry or entry["outcome"] not in REVIEW_OUTCOMES:
+            return False
+        if entry["outcome"] == "skip" and self.skip_ttl is not None:
+            return time.time() - entry["updated_at"] < self.skip_ttl
+        return True
+
+    def record(self, filepath: str, outcome: str, song_id: int = None):
+        """Store the outcome for a file along with its current size and mtime."""
+        try:
+            st = os.stat(filepath)
+            size, mtime = st.st_size, st.st_mtime
+        except OSError:
+            size, mtime = None, None
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, outcome, song_id, size, mtime, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (filepath, outcome, song_id, size, mtime, now)
+            )
+        self.entries[filepath] = {"outcome": outcome, "song_id": song_id, "size": size, "mtime": mtime, "updated_at": now}
+
+    def import_review_file(self, review_file: str, outcome: str) -> int:
+        """Import a legacy manual_review.txt / skipped_review.txt list. Returns the number of rows added."""
+        if not os.path.exists(review_file):
+            return 0
+        with open(review_file, "r", encoding="utf-8") as f:
+            paths = [line.strip() for line in f if line.strip()]
+        now = time.time()
+        rows = [(p, outcome, None, None, None, now) for p in dict.fromkeys(paths) if p not in self.entries]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO files (path, outcome, song_id, size, mtime, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        for p, *_ in rows:
+            self.entries[p] = {"outcome": outcome, "song_id": None, "size": None, "mtime": None, "updated_at": now}
+        return len(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+class SearchCache:
+    """
+    Genius search hits keyed by normalized query. Empty results are cached too,
+    but expire after negative_ttl instead of ttl, so "not found" tracks are
+    retried eventually. Safe to share between lookup worker threads.
+    """
+
+    def __init__(self, db_path: str = STATE_DB, ttl: float = SEARCH_TTL, negative_ttl: float = NEGATIVE_TTL):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT PRIMARY KEY,
+                hits TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join((query or "").lower().split())
+
+    def get(self, query: str):
+        """Cached list of hit dicts, or None if missing or expired."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT hits, fetched_at FROM searches WHERE query = ?", (self.normalize(query),)
+            ).fetchone()
+        if not row:
+            return None
+        hits = json.loads(row[0])
+        ttl = self.ttl if hits else self.negative_ttl
+        if ttl is not None and time.time() - row[1] > ttl:
+            return None
+        return hits
+
+    def put(self, query: str, hits: list):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches (query, hits, fetched_at) VALUES (?, ?, ?)",
+                (self.normalize(query), json.dumps(hits), time.time())
+            )
+
+    def forget(self, query: str):
+        """Drop a cached search, e.g. hits that matched nothing, so the next lookup searches again."""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM searches WHERE query = ?", (self.normalize(query),))
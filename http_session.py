@@ -0,0 +1,144 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) timeouts applied when a caller doesn't pass one
+DEFAULT_TIMEOUT = (5, 20)
+# Hosts kept in the pool, and keep-alive connections kept per host
+POOL_HOSTS = 16
+POOL_PER_HOST = 8
+# Retries after a 429/5xx or a connection error, waiting a random 0..BACKOFF * 2**attempt seconds
+MAX_RETRIES = 3
+BACKOFF = 0.5
+MAX_WAIT = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Only these are retried after a 5xx or a dropped connection; a 429 means nothing was done, so any method is
+IDEMPOTENT = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class HostStats:
+    """Request count, errors and latency per host, shared by every session in the process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def _row(self, url: str) -> dict:
+        return self.hosts.setdefault(urlsplit(url).netloc, {"requests": 0, "errors": 0, "retries": 0, "total": 0.0, "max": 0.0})
+
+    def record(self, url: str, seconds: float, status=None):
+        """One finished request; status None means it failed without a response."""
+        with self.lock:
+            row = self._row(url)
+            row["requests"] += 1
+            row["total"] += seconds
+            row["max"] = max(row["max"], seconds)
+            if status is None or status >= 400:
+                row["errors"] += 1
+
+    def retried(self, url: str):
+        with self.lock:
+            self._row(url)["retries"] += 1
+
+    def snapshot(self) -> dict:
+        """{host: {"requests", "errors", "retries", "mean_ms", "max_ms"}}"""
+        with self.lock:
+            return {
+                host: {"requests": row["requests"], "errors": row["errors"], "retries": row["retries"],
+                       "mean_ms": row["total"] / row["requests"] * 1000 if row["requests"] else 0.0,
+                       "max_ms": row["max"] * 1000}
+                for host, row in self.hosts.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.hosts.clear()
+
+    def report(self):
+        rows = self.snapshot()
+        if not rows:
+            return
+        print("\n🌐 HTTP per host:")
+        for host, row in sorted(rows.items(), key=lambda item: -item[1]["requests"]):
+            print(f"  {host}: {row['requests']} requests, {row['mean_ms']:.0f} ms mean, {row['max_ms']:.0f} ms max, "
+                  f"{row['errors']} errors, {row['retries']} retries")
+
+
+host_stats = HostStats()
+
+
+def backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff: a random wait in [0, BACKOFF * 2**attempt], capped at MAX_WAIT."""
+    return random.uniform(0, min(MAX_WAIT, BACKOFF * 2 ** attempt))
+
+
+def retry_after(response) -> float:
+    try:
+        return min(MAX_WAIT, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+class Session(requests.Session):
+    """
+    requests.Session with pooled keep-alive connections per host, a default
+    timeout, retries with jittered backoff on 429/5xx and connection errors,
+    and latency recorded per host in host_stats.
+
+    request() takes two extra keywords: retries (default MAX_RETRIES) and
+    retry_statuses (default RETRY_STATUSES), e.g. for callers that handle 429 themselves.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries: int = MAX_RETRIES):
+        super().__init__()
+        self.default_timeout = timeout
+        self.retries = retries
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, retries: int = None, retry_statuses=RETRY_STATUSES, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        retries = self.retries if retries is None else retries
+        idempotent = method.upper() in IDEMPOTENT
+        for attempt in range(retries + 1):
+            start = time.monotonic()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                host_stats.record(url, time.monotonic() - start)
+                if not idempotent or attempt == retries:
+                    raise
+                host_stats.retried(url)
+                time.sleep(backoff(attempt))
+                continue
+            host_stats.record(url, time.monotonic() - start, response.status_code)
+            status = response.status_code
+            if status not in retry_statuses or attempt == retries or (status != 429 and not idempotent):
+                return response
+            host_stats.retried(url)
+            response.close()
+            time.sleep(retry_after(response) or backoff(attempt))
+
+
+# Shared by every module that talks HTTP; connections are reused across calls and threads
+session = Session()
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return session.get(url, **kwargs)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    return session.request(method, url, **kwargs)
+
+
+def adopt(session_to_replace: requests.Session) -> Session:
+    """A pooled, retrying Session carrying another session's headers, e.g. to swap into a third-party client."""
+    replacement = Session()
+    replacement.headers.update(session_to_replace.headers)
+    replacement.proxies.update(session_to_replace.proxies)
+    return replacement
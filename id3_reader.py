@@ -0,0 +1,181 @@
+import struct
+import zlib
+
+# Frames whose bodies are never needed by the quick checks; always seeked past
+SKIP_FRAMES = {"APIC", "GEOB", "PRIV"}
+
+_ENCODINGS = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}
+
+
+class UnsupportedTag(Exception):
+    """The tag uses a feature the fast reader doesn't handle; fall back to mutagen."""
+
+
+def _syncsafe(data: bytes) -> int:
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _terminator(encoding: int) -> bytes:
+    return b"\x00\x00" if encoding in (1, 2) else b"\x00"
+
+
+def _split_terminated(data: bytes, encoding: int):
+    """Split `data` at the first encoding-aware null terminator."""
+    term = _terminator(encoding)
+    step = len(term)
+    idx = 0
+    while True:
+        idx = data.find(term, idx)
+        if idx == -1:
+            return data, b""
+        if idx % step == 0:
+            return data[:idx], data[idx + step:]
+        idx += 1
+
+
+def _decode(data: bytes, encoding: int) -> str:
+    if encoding not in _ENCODINGS:
+        raise UnsupportedTag(f"unknown text encoding {encoding}")
+    return data.decode(_ENCODINGS[encoding], errors="replace")
+
+
+def _decode_frame(frame_id: str, body: bytes) -> list:
+    """Decode the text content of a frame into a list of strings."""
+    if not body:
+        return []
+    encoding = body[0]
+    data = body[1:]
+
+    if frame_id in ("USLT", "COMM"):
+        # encoding, 3-byte language, null-terminated description, text
+        _, text = _split_terminated(data[3:], encoding)
+        return [_decode(text, encoding).rstrip("\x00")]
+    if frame_id == "TXXX":
+        desc, value = _split_terminated(data, encoding)
+        return [f"{_decode(desc, encoding)}\x00{_decode(value, encoding).rstrip(chr(0))}"]
+    if frame_id.startswith("T"):
+        values = []
+        rest = data
+        while rest:
+            value, rest = _split_terminated(rest, encoding)
+            values.append(_decode(value, encoding))
+        return [v for v in values if v] or [""]
+    if frame_id.startswith("W"):
+        return [body.split(b"\x00", 1)[0].decode("latin-1")]
+    return [body]
+
+
+def _inflate(body: bytes) -> bytes:
+    try:
+        return zlib.decompress(body)
+    except zlib.error as e:
+        raise UnsupportedTag(f"bad compressed frame: {e}")
+
+
+def tag_size(fileobj) -> int:
+    """
+    Total size in bytes of the ID3v2 tag at the start of `fileobj` (header,
+    frames, padding and footer), or 0 if there is none. Leaves the file
+    positioned at the first byte of audio.
+    """
+    fileobj.seek(0)
+    header = fileobj.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        fileobj.seek(0)
+        return 0
+    size = 10 + _syncsafe(header[6:10])
+    if header[5] & 0x10:  # footer present
+        size += 10
+    fileobj.seek(size)
+    return size
+
+
+def read_frames(file, frame_ids, first_only: bool = False):
+    """
+    Read only the requested frames from the ID3v2 tag at the start of `file`
+    (a path or a binary file object), seeking past every other frame body.
+
+    Returns a dict {frame_id: [text, ...]} with one entry per requested frame
+    found (repeated frames such as USLT append to the list), or None when the
+    file has no ID3v2 tag. Raises UnsupportedTag for ID3v2.2, tag-level
+    unsynchronisation and other cases where the caller should use mutagen.
+    With first_only=True reading stops as soon as every requested frame has
+    been seen once.
+    """
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        with open(file, "rb") as f:
+            return read_frames(f, frame_ids, first_only)
+
+    wanted = set(frame_ids)
+    f = file
+    f.seek(0)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return None
+
+    version, flags = header[3], header[5]
+    if version not in (3, 4):
+        raise UnsupportedTag(f"ID3v2.{version}")
+    if flags & 0x80:
+        raise UnsupportedTag("tag-level unsynchronisation")
+    end = 10 + _syncsafe(header[6:10])
+
+    pos = 10
+    if flags & 0x40:  # extended header
+        ext = f.read(4)
+        ext_size = _syncsafe(ext) if version == 4 else struct.unpack(">I", ext)[0] + 4
+        pos += ext_size
+        f.seek(pos)
+
+    found = {}
+    while pos + 10 <= end:
+        frame_header = f.read(10)
+        if len(frame_header) < 10 or frame_header[0] == 0:
+            break  # padding
+        try:
+            frame_id = frame_header[:4].decode("ascii")
+        except UnicodeDecodeError:
+            raise UnsupportedTag("bad frame id")
+        if version == 4:
+            size = _syncsafe(frame_header[4:8])
+        else:
+            size = struct.unpack(">I", frame_header[4:8])[0]
+        pos += 10
+        if pos + size > end:
+            raise UnsupportedTag(f"frame {frame_id} overruns the tag")
+
+        if frame_id not in wanted or frame_id in SKIP_FRAMES:
+            pos += size
+            f.seek(pos)
+            continue
+
+        body = f.read(size)
+        pos += size
+        fmt_flags = frame_header[9]
+        if version == 4:
+            if fmt_flags & 0x04:  # encrypted
+                continue
+            if fmt_flags & 0x02:
+                raise UnsupportedTag("frame-level unsynchronisation")
+            if fmt_flags & 0x40:  # grouping identity byte
+                body = body[1:]
+            if fmt_flags & 0x01:  # data length indicator
+                body = body[4:]
+            if fmt_flags & 0x08:
+                body = _inflate(body)
+        else:
+            if fmt_flags & 0x40:  # encrypted
+                continue
+            compressed = fmt_flags & 0x80
+            offset = 4 if compressed else 0  # decompressed size
+            if fmt_flags & 0x20:  # grouping identity byte
+                offset += 1
+            body = body[offset:]
+            if compressed:
+                body = _inflate(body)
+
+        found.setdefault(frame_id, []).extend(_decode_frame(frame_id, body))
+        if first_only and wanted.issubset(found):
+            break
+
+    return found
@@ -1,6 +1,7 @@
 import os
 import argparse
-from mutagen.mp3 import MP3
+from mutagen.mp3 import MPEGInfo
+from id3_reader import tag_size
 
 def find_missing_cues(start_dir):
     missing_cues = []
@@ -15,9 +16,11 @@ def find_missing_cues(start_dir):
             if file.lower().endswith('.mp3'):
                 file_path = os.path.join(root, file)
                 try:
-                    audio = MP3(file_path)
+                    # Only the audio stream info is needed, so jump over the ID3 tag (and its cover art)
+                    with open(file_path, "rb") as f:
+                        info = MPEGInfo(f, tag_size(f))
                     # Check if duration is longer than 25 minutes (1500 seconds)
-                    if audio.info.length > 1500:
+                    if info.length > 1500:
                         if not has_cue:
                             missing_cues.append(file_path)
                             print(f"Found missing cue: {file_path}")
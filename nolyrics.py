@@ -3,10 +3,16 @@ import glob
 from mutagen.id3 import ID3, ID3NoHeaderError
 from tqdm import tqdm
 from utils import safe_filename
+from id3_reader import read_frames, UnsupportedTag
 
 
 def has_lyrics(filepath: str) -> bool:
     """Check if MP3 already has lyrics tag."""
+    try:
+        frames = read_frames(filepath, ("USLT",))
+        return bool(frames) and any(text.strip() for text in frames.get("USLT", []))
+    except UnsupportedTag:
+        pass
     try:
         tags = ID3(filepath)
         return any(frame.FrameID == "USLT" and frame.text.strip() for frame in tags.values())
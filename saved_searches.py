@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import threading
+import time
+import argparse
+
+SAVED_DB = "saved_searches.db"
+LEGACY_FILE = "saved_searches.txt"
+
+
+class SavedSearches:
+    """
+    Persistent search key -> Discogs release id index for discogs_tagger.
+
+    Keys are stored lowercased under a primary-key index, so exact and prefix
+    lookups are single index probes instead of a scan of every saved line.
+    Each add() commits on its own and the database runs in WAL mode with a
+    busy timeout, so several taggers can append at the same time.
+    The legacy saved_searches.txt is imported the first time the database is created.
+    """
+
+    def __init__(self, db_path: str = SAVED_DB, legacy_file: str = LEGACY_FILE):
+        created = not os.path.exists(db_path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                key TEXT PRIMARY KEY,
+                release_id INTEGER NOT NULL,
+                saved_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+        if created and legacy_file and os.path.exists(legacy_file):
+            count = self.import_text(legacy_file)
+            print(f"📥 Imported {count} saved searches from {legacy_file}")
+
+    def get(self, key: str):
+        """Release id saved for exactly this key, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT release_id FROM searches WHERE key = ?", (key.strip().lower(),)).fetchone()
+        return row[0] if row else None
+
+    def prefix(self, prefix: str, limit: int = 20) -> list:
+        """[(key, release_id), ...] for keys starting with prefix, in key order."""
+        low = prefix.strip().lower()
+        with self.lock:
+            return self.conn.execute(
+                "SELECT key, release_id FROM searches WHERE key >= ? AND key < ? ORDER BY key LIMIT ?",
+                (low, low + "\uffff", limit)
+            ).fetchall()
+
+    def add(self, key: str, release_id):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches (key, release_id, saved_at) VALUES (?, ?, ?)",
+                (key.strip().lower(), int(release_id), time.time())
+            )
+
+    def import_text(self, path: str) -> int:
+        """Load 'key discogs:<id>' lines; later lines win. Returns the number of keys imported."""
+        entries = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if "discogs:" not in line:
+                    continue
+                key, release_id = line.rsplit("discogs:", 1)
+                key, release_id = key.strip().lower(), release_id.strip()
+                if key and release_id.isdigit():
+                    entries[key] = int(release_id)
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO searches (key, release_id, saved_at) VALUES (?, ?, ?)",
+                [(key, release_id, now) for key, release_id in entries.items()]
+            )
+        return len(entries)
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saved Discogs searches")
+    parser.add_argument("--import", dest="import_file", type=str, help=f"Import a text file of 'key discogs:<id>' lines (e.g. {LEGACY_FILE})")
+    parser.add_argument("--find", type=str, help="List saved keys starting with this prefix")
+    args = parser.parse_args()
+
+    store = SavedSearches()
+    if args.import_file:
+        print(f"📥 Imported {store.import_text(args.import_file)} saved searches from {args.import_file}")
+    if args.find is not None:
+        for key, release_id in store.prefix(args.find):
+            print(f"{key} discogs:{release_id}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from rapidfuzz import fuzz, process
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace, so each string is prepared exactly once."""
+    return " ".join((text or "").lower().split())
+
+
+def rank(queries, candidates, scorer=fuzz.token_sort_ratio):
+    """
+    Score every candidate string against every query variant (e.g. base,
+    flipped, keep_main) in a single rapidfuzz cdist call.
+
+    Returns [(score, candidate_index), ...] sorted by score descending, where
+    score is the candidate's best score over all variants. Ties keep the
+    candidates' original order.
+    """
+    if not candidates:
+        return []
+    variants = list(dict.fromkeys(normalize(q) for q in queries if q))
+    if not variants:
+        return [(0.0, i) for i in range(len(candidates))]
+
+    matrix = process.cdist(variants, [normalize(c) for c in candidates], scorer=scorer)
+    best = matrix.max(axis=0)
+    ranked = [(float(score), i) for i, score in enumerate(best)]
+    ranked.sort(key=lambda x: x[0], reverse=True)
+    return ranked
@@ -0,0 +1,402 @@
+import re
+import json
+import zlib
+import time
+import random
+import argparse
+import threading
+from collections import Counter, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-in for the parts of the Genius and Discogs APIs that
+# lyricsgenius and discogs_client use, so the taggers can be benchmarked
+# without touching (or being rate limited by) the real services.
+#
+#   Genius  API root  http://host:port/genius/       search, songs/<id>
+#           web root  http://host:port/genius/web/   song pages (lyrics HTML)
+#   Discogs base url  http://host:port/discogs       database/search, releases/<id>, masters/<id>
+#   Images            http://host:port/images/<release_id>.jpg
+#   Stats             http://host:port/_stats  (GET counts, ?reset=1 clears them)
+
+ADJECTIVES = ["Blue", "Silent", "Golden", "Broken", "Electric", "Velvet", "Midnight", "Crystal",
+              "Wild", "Hollow", "Neon", "Paper", "Burning", "Distant", "Frozen", "Secret"]
+NOUNS = ["River", "Heart", "Machine", "Garden", "Signal", "Mirror", "Horizon", "Echo",
+         "Ocean", "Shadow", "Engine", "Window", "Satellite", "Forest", "Fever", "Station"]
+LABELS = ["Warp Records", "Ninja Tune", "XL Recordings", "Domino", "4AD", "Sub Pop", "Rough Trade"]
+FORMATS = [
+    {"name": "Vinyl", "qty": "1", "descriptions": ["LP", "Album"]},
+    {"name": "CD", "qty": "1", "descriptions": ["Album"]},
+    {"name": "File", "qty": "1", "descriptions": ["MP3", "Album"]},
+]
+GENRES = ["Electronic", "Rock", "Hip Hop", "Jazz", "Pop"]
+
+
+def slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-")
+
+
+def build_catalog(albums: int = 10, tracks: int = 10, seed: int = 0, missing: float = 0.1, decoys: int = 2):
+    """
+    Deterministic fake catalog shared by the stand-in server and the benchmark
+    corpus generator. Every album has `decoys` extra Discogs releases (other
+    pressings/editions) so searches return several candidates. A `missing`
+    fraction of the tracks has no Genius entry.
+    """
+    rng = random.Random(seed)
+    releases, songs = [], []
+    next_release_id, next_song_id = 1000, 5000
+    for a in range(albums):
+        artist = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+        album = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {a + 1}"
+        year = rng.randint(1975, 2024)
+        master_id = 90000 + a
+        tracklist = []
+        for t in range(tracks):
+            title = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+            song = None
+            if rng.random() >= missing:
+                song = {
+                    "id": next_song_id,
+                    "title": title,
+                    "artist": artist,
+                    "lyrics": "\n".join(f"{title} line {n}" for n in range(rng.randint(8, 24))),
+                }
+                songs.append(song)
+                next_song_id += 1
+            tracklist.append({"position": str(t + 1), "title": title, "song_id": song["id"] if song else None})
+
+        for edition in range(decoys + 1):
+            title = album if edition == 0 else f"{album} ({'Deluxe Edition' if edition % 2 else 'Remastered'})"
+            releases.append({
+                "id": next_release_id,
+                "artist": artist,
+                "title": title,
+                "year": year + edition * rng.randint(0, 8),
+                "label": LABELS[(a + edition) % len(LABELS)],
+                "catno": f"CAT{next_release_id}",
+                "format": FORMATS[(a + edition) % len(FORMATS)],
+                "genre": GENRES[a % len(GENRES)],
+                "country": rng.choice(["UK", "US", "Germany", "Europe"]),
+                "master_id": master_id,
+                "tracklist": tracklist,
+            })
+            next_release_id += 1
+    return {"releases": releases, "songs": songs, "albums": albums, "tracks": tracks}
+
+
+def write_release_dump(catalog: dict, path: str):
+    """Write the catalog's releases as a Discogs data dump (releases XML, image URLs left blank like the real dumps)."""
+    from xml.sax.saxutils import escape, quoteattr
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<releases>\n")
+        for r in catalog["releases"]:
+            fmt = r["format"]
+            f.write(
+                f'<release id="{r["id"]}" status="Accepted">'
+                f'<images><image height="600" type="primary" uri="" uri150="" width="600"/></images>'
+                f'<artists><artist><id>{zlib.crc32(r["artist"].encode()) % 100000}</id><name>{escape(r["artist"])}</name>'
+                f'<anv></anv><join></join><role></role><tracks></tracks></artist></artists>'
+                f'<title>{escape(r["title"])}</title>'
+                f'<labels><label catno={quoteattr(r["catno"])} id="1" name={quoteattr(r["label"])}/></labels>'
+                f'<formats><format name={quoteattr(fmt["name"])} qty="{fmt["qty"]}" text=""><descriptions>'
+                + "".join(f"<description>{escape(d)}</description>" for d in fmt["descriptions"]) +
+                f'</descriptions></format></formats>'
+                f'<genres><genre>{escape(r["genre"])}</genre></genres><styles></styles>'
+                f'<country>{escape(r["country"])}</country><released>{r["year"]}-01-01</released>'
+                f'<master_id is_main_release="false">{r["master_id"]}</master_id><tracklist>'
+                + "".join(f"<track><position>{t['position']}</position><title>{escape(t['title'])}</title><duration></duration></track>"
+                          for t in r["tracklist"]) +
+                "</tracklist></release>\n"
+            )
+        f.write("</releases>\n")
+
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r"\w+", (text or "").lower()))
+
+
+def _search(items, query: str, text_of, limit: int):
+    """Rank items by token overlap with the query, like a (very) simple search engine."""
+    wanted = _tokens(query)
+    scored = []
+    for item in items:
+        overlap = len(wanted & _tokens(text_of(item)))
+        if overlap:
+            scored.append((overlap, item))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [item for _, item in scored[:limit]]
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, catalog, latency: float = 0.0, genius_rate: int = 0, discogs_rate: int = 60,
+                 cover_kb: int = 200):
+        super().__init__(address, StandInHandler)
+        self.catalog = catalog
+        self.releases = {r["id"]: r for r in catalog["releases"]}
+        self.songs = {s["id"]: s for s in catalog["songs"]}
+        self.latency = latency
+        self.limits = {"genius": genius_rate, "discogs": discogs_rate}
+        self.windows = {"genius": deque(), "discogs": deque()}
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        rng = random.Random(0)
+        self.cover = b"\xff\xd8\xff\xe0" + rng.randbytes(cover_kb * 1024) + b"\xff\xd9"
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def take_token(self, api: str):
+        """Sliding one-minute window per API. Returns (allowed, used, remaining)."""
+        limit = self.limits.get(api) or 0
+        with self.lock:
+            window = self.windows[api]
+            now = time.monotonic()
+            while window and now - window[0] > 60:
+                window.popleft()
+            if limit and len(window) >= limit:
+                return False, len(window), 0
+            window.append(now)
+            return True, len(window), (limit - len(window)) if limit else 1000
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+    protocol_version = "HTTP/1.1"
+    # headers and body go out as separate writes; real servers don't stall kept-alive clients on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt, *args):
+        pass
+
+    # --- helpers ---
+    def send_body(self, status: int, body: bytes, content_type: str, headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, data, headers: dict = None):
+        self.send_body(status, json.dumps(data).encode("utf-8"), "application/json", headers)
+
+    # --- routing ---
+    def do_GET(self):
+        url = urlparse(self.path)
+        qs = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path
+
+        if path == "/_stats":
+            with self.server.lock:
+                stats = dict(self.server.stats)
+                if qs.get("reset"):
+                    self.server.stats.clear()
+            return self.send_json(200, stats)
+
+        api = "genius" if path.startswith("/genius/") else "discogs" if path.startswith("/discogs/") else "images"
+        endpoint = self.endpoint_name(path)
+        with self.server.lock:
+            self.server.stats[endpoint] += 1
+            self.server.stats[f"{api}_total"] += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        headers = {}
+        if api in ("genius", "discogs"):
+            allowed, used, remaining = self.server.take_token(api)
+            if api == "discogs":
+                headers = {"X-Discogs-Ratelimit": self.server.limits["discogs"] or 1000,
+                           "X-Discogs-Ratelimit-Used": used,
+                           "X-Discogs-Ratelimit-Remaining": remaining}
+            if not allowed:
+                with self.server.lock:
+                    self.server.stats[f"{api}_429"] += 1
+                headers["Retry-After"] = 60
+                return self.send_json(429, {"message": "You are making requests too quickly."}, headers)
+
+        if api == "genius":
+            return self.genius(path[len("/genius/"):], qs)
+        if api == "discogs":
+            return self.discogs(path[len("/discogs/"):], qs, headers)
+        if path.startswith("/images/"):
+            return self.send_body(200, self.server.cover, "image/jpeg")
+        self.send_json(404, {"message": "Not found"})
+
+    @staticmethod
+    def endpoint_name(path: str) -> str:
+        if path.startswith("/genius/web/"):
+            return "genius_page"
+        if path.startswith("/genius/songs/"):
+            return "genius_song"
+        if path.startswith("/genius/search"):
+            return "genius_search"
+        if path.startswith("/discogs/database/search"):
+            return "discogs_search"
+        if path.startswith("/discogs/releases/"):
+            return "discogs_release"
+        if path.startswith("/discogs/masters/"):
+            return "discogs_master"
+        if path.startswith("/images/"):
+            return "image"
+        return "other"
+
+    # --- Genius ---
+    def song_hit(self, song: dict) -> dict:
+        path = f"{slug(song['artist'])}-{slug(song['title'])}-lyrics-{song['id']}"
+        return {
+            "id": song["id"],
+            "title": song["title"],
+            "full_title": f"{song['title']} by {song['artist']}",
+            "path": f"/{path}",
+            "url": f"https://genius.com/{path}",
+            "primary_artist": {"id": zlib.crc32(song["artist"].encode()) % 100000, "name": song["artist"]},
+        }
+
+    def genius(self, path: str, qs: dict):
+        if path == "search":
+            per_page = int(qs.get("per_page") or 10)
+            found = _search(self.server.catalog["songs"], qs.get("q", ""),
+                            lambda s: f"{s['title']} {s['artist']}", per_page)
+            hits = [{"index": "song", "type": "song", "result": self.song_hit(s)} for s in found]
+            return self.send_json(200, {"meta": {"status": 200}, "response": {"hits": hits}})
+
+        m = re.match(r"songs/(\d+)$", path)
+        if m and int(m.group(1)) in self.server.songs:
+            return self.send_json(200, {"meta": {"status": 200},
+                                        "response": {"song": self.song_hit(self.server.songs[int(m.group(1))])}})
+
+        m = re.match(r"web/.+-lyrics-(\d+)$", path)
+        if m and int(m.group(1)) in self.server.songs:
+            song = self.server.songs[int(m.group(1))]
+            lines = "<br/>".join(song["lyrics"].splitlines())
+            html = (f"<html><head><title>{song['title']}</title></head><body>"
+                    f"<div data-lyrics-container=\"true\">{lines}</div></body></html>")
+            return self.send_body(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+        self.send_json(404, {"meta": {"status": 404, "message": "Not found"}})
+
+    # --- Discogs ---
+    def release_summary(self, release: dict) -> dict:
+        base = self.server.base_url
+        return {
+            "id": release["id"],
+            "type": "release",
+            "title": f"{release['artist']} - {release['title']}",
+            "year": str(release["year"]),
+            "country": release["country"],
+            "label": [release["label"]],
+            "format": [release["format"]["name"]] + release["format"]["descriptions"],
+            "genre": [release["genre"]],
+            "catno": release["catno"],
+            "master_id": release["master_id"],
+            "thumb": f"{base}/images/{release['id']}.jpg",
+            "cover_image": f"{base}/images/{release['id']}.jpg",
+            "uri": f"/release/{release['id']}-{slug(release['artist'])}-{slug(release['title'])}",
+            "resource_url": f"{base}/discogs/releases/{release['id']}",
+        }
+
+    def release_full(self, release: dict) -> dict:
+        base = self.server.base_url
+        return {
+            "id": release["id"],
+            "title": release["title"],
+            "year": release["year"],
+            "released": f"{release['year']}-01-01",
+            "country": release["country"],
+            "artists": [{"id": zlib.crc32(release["artist"].encode()) % 100000, "name": release["artist"],
+                         "resource_url": f"{base}/discogs/artists/1"}],
+            "labels": [{"id": 1, "name": release["label"], "catno": release["catno"],
+                        "resource_url": f"{base}/discogs/labels/1"}],
+            "formats": [release["format"]],
+            "genres": [release["genre"]],
+            "styles": [],
+            "master_id": release["master_id"],
+            "images": [{"type": "primary", "uri": f"{base}/images/{release['id']}.jpg",
+                        "resource_url": f"{base}/images/{release['id']}.jpg", "width": 600, "height": 600}],
+            "tracklist": [{"position": t["position"], "title": t["title"], "type_": "track", "duration": ""}
+                          for t in release["tracklist"]],
+            "uri": f"https://www.discogs.com/release/{release['id']}-{slug(release['artist'])}-{slug(release['title'])}",
+            "resource_url": f"{base}/discogs/releases/{release['id']}",
+        }
+
+    def discogs(self, path: str, qs: dict, headers: dict):
+        if path == "database/search":
+            per_page = int(qs.get("per_page") or 50)
+            page = int(qs.get("page") or 1)
+            found = _search(self.server.catalog["releases"], qs.get("q", ""),
+                            lambda r: f"{r['artist']} {r['title']} {r['year']}", 500)
+            pages = max(1, -(-len(found) // per_page))
+            chunk = found[(page - 1) * per_page:page * per_page]
+            return self.send_json(200, {
+                "pagination": {"page": page, "pages": pages, "per_page": per_page, "items": len(found), "urls": {}},
+                "results": [self.release_summary(r) for r in chunk],
+            }, headers)
+
+        m = re.match(r"releases/(\d+)$", path)
+        if m and int(m.group(1)) in self.server.releases:
+            return self.send_json(200, self.release_full(self.server.releases[int(m.group(1))]), headers)
+
+        m = re.match(r"masters/(\d+)$", path)
+        if m:
+            editions = [r for r in self.server.catalog["releases"] if r["master_id"] == int(m.group(1))]
+            if editions:
+                main = editions[0]
+                return self.send_json(200, {
+                    "id": main["master_id"], "title": main["title"], "year": main["year"],
+                    "main_release": main["id"], "artists": self.release_full(main)["artists"],
+                    "resource_url": f"{self.server.base_url}/discogs/masters/{main['master_id']}",
+                }, headers)
+
+        self.send_json(404, {"message": "The requested resource was not found."}, headers)
+
+
+def start_server(catalog, host: str = "127.0.0.1", port: int = 0, **options) -> StandInServer:
+    """Start a stand-in server on a background thread (port 0 picks a free port)."""
+    server = StandInServer((host, port), catalog, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def point_clients_at(base_url: str, genius_client=None, discogs_clients=()):
+    """Redirect a lyricsgenius.Genius and discogs_client.Client instances to a stand-in server."""
+    if genius_client is not None:
+        genius_client.API_ROOT = f"{base_url}/genius/"
+        genius_client.PUBLIC_API_ROOT = f"{base_url}/genius/"
+        genius_client.WEB_ROOT = f"{base_url}/genius/web/"
+    for client in discogs_clients:
+        client._base_url = f"{base_url}/discogs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Genius/Discogs stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.15, help="Seconds added to every request")
+    parser.add_argument("--genius-rate", type=int, default=0, help="Genius requests per minute (0 = unlimited)")
+    parser.add_argument("--discogs-rate", type=int, default=60, help="Discogs requests per minute (0 = unlimited)")
+    parser.add_argument("--cover-kb", type=int, default=200, help="Size of the served cover images")
+    parser.add_argument("--albums", type=int, default=10)
+    parser.add_argument("--tracks", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.albums, args.tracks, args.seed)
+    server = StandInServer((args.host, args.port), catalog, latency=args.latency, genius_rate=args.genius_rate,
+                           discogs_rate=args.discogs_rate, cover_kb=args.cover_kb)
+    print(f"🛰️ Stand-in server on {server.base_url} "
+          f"({len(catalog['releases'])} releases, {len(catalog['songs'])} songs)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
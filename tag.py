@@ -1,53 +1,94 @@
 import os
-from mutagen.id3 import ID3, APIC, TOAL, TSRC, TALB, TPE1, TPE2, TIT2, TCON, TDRC, TPUB, TDOR, COMM, TCOM, USLT, TRCK, ID3NoHeaderError
-import requests
+from mutagen.id3 import ID3, ID3NoHeaderError, error
 from tqdm import tqdm
 from utils import normalize_yt_title, merge_feat, fetch_and_crop_cover, clean_discogs_artist
-from yt import get_yt_metadata
+from yt import get_yt_metadata, yt_metadata_from_info
+from id3_reader import read_frames, UnsupportedTag
+from cover_cache import cover_cache
+from tag_writer import open_writer
 
-def tagged_with_discogs(filepath: str):
 
-    try:
-        tags = ID3(filepath)
-    except ID3NoHeaderError:
-        tags = None
-
-    url = None
-    if tags:
-        if "TOAL" in tags:
-            url = str(tags["TOAL"])
-            if url == "" or not "discogs" in url:
-                url = None
-
-    return url
-
-
-def get_metadata_tags(filepath: str):
+class TagSnapshot:
     """
-    Return (title, artist) from ID3 tags.
-    - Title from TIT2
-    - Album Artist (TPE2), unless it contains 'VVAA'
-    - If VVAA in Album Artist, fallback to Artist (TPE1)
+    One parse of an MP3's ID3 tag, shared by every check and writer in a pipeline.
+    Read the lyrics / Discogs URL / metadata views from it, queue frame changes
+    with add()/delall(), then write everything back with a single save().
     """
-    try:
-        tags = ID3(filepath)
-    except ID3NoHeaderError:
-        tags = None
 
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.has_header = True
+        self.readable = True
+        self.dirty = False
+        try:
+            self.id3 = ID3(filepath)
+        except ID3NoHeaderError:
+            self.id3 = ID3()
+            self.has_header = False
+        except error:
+            self.id3 = ID3()
+            self.has_header = False
+            self.readable = False
+
+    @property
+    def lyrics(self):
+        """Text of the first non-empty USLT frame, or None."""
+        for frame in self.id3.getall("USLT"):
+            if frame.text.strip():
+                return frame.text
+        return None
+
+    @property
+    def discogs_url(self):
+        """Discogs release URL stored in TOAL, or None."""
+        url = str(self.id3["TOAL"]) if "TOAL" in self.id3 else ""
+        if url == "" or "discogs" not in url:
+            return None
+        return url
+
+    def metadata_tags(self):
+        """(title, artist, album, year) - see get_metadata_tags."""
+        frames = {key: str(self.id3[key]) for key in METADATA_FRAMES if key in self.id3} if self.has_header else None
+        return _metadata_tags(self.filepath, frames)
+
+    def add(self, frame):
+        self.id3.add(frame)
+        self.dirty = True
+
+    def delall(self, frame_id: str):
+        self.id3.delall(frame_id)
+        self.dirty = True
+
+    def save(self, v2_version: int = 4):
+        """Write all pending changes in one go (no-op if nothing changed)."""
+        if self.dirty:
+            self.id3.save(self.filepath, v2_version=v2_version)
+            self.has_header = True
+            self.dirty = False
+
+
+# TYER: ID3v2.3 year, which mutagen converts to TDRC but the fast reader returns as stored
+METADATA_FRAMES = ("TIT2", "TALB", "TDRC", "TYER", "TPE1", "TPE2")
+
+
+def _metadata_tags(filepath: str, tags):
+    """(title, artist, album, year) from a {frame_id: text} mapping, or None if the file has no tag."""
     title, artist, album, year = None, None, None, None
     if tags:
         if "TIT2" in tags:
-            title = str(tags["TIT2"])
+            title = tags["TIT2"]
         if "TALB" in tags:
-            album = str(tags["TALB"])
+            album = tags["TALB"]
         if "TDRC" in tags:
-            year = str(tags["TDRC"])
+            year = tags["TDRC"]
+        elif "TYER" in tags:
+            year = tags["TYER"]
         if "TPE2" in tags:  # Album Artist
-            artist = str(tags["TPE2"])
+            artist = tags["TPE2"]
         if artist:
             if "VVAA" in artist.upper():
                 if "TPE1" in tags:  # fallback to Artist
-                    artist = str(tags["TPE1"])
+                    artist = tags["TPE1"]
 
     # fallback from filename if missing
     if not title:
@@ -55,7 +96,7 @@ def get_metadata_tags(filepath: str):
     if not artist:
         if tags:
             if "TPE1" in tags:
-                artist = str(tags["TPE1"])
+                artist = tags["TPE1"]
             else:
                 tqdm.write(f"⛔ Artist is None! in {filepath}")
                 artist = "NOARTIST"
@@ -67,99 +108,151 @@ def get_metadata_tags(filepath: str):
     return title.strip(), artist.strip(), album, year
 
 
+def load_snapshot(file) -> TagSnapshot:
+    """Accept either a path or an existing TagSnapshot."""
+    return file if isinstance(file, TagSnapshot) else TagSnapshot(file)
+
+
+def tagged_with_discogs(file):
+    """Discogs URL from TOAL, or None. Paths are read with the fast frame reader."""
+    if isinstance(file, str):
+        try:
+            frames = read_frames(file, ("TOAL",), first_only=True) or {}
+            url = "\x00".join(frames.get("TOAL", []))
+            return url if "discogs" in url else None
+        except UnsupportedTag:
+            pass
+    return load_snapshot(file).discogs_url
+
+
+def get_metadata_tags(file):
+    """
+    Return (title, artist, album, year) from ID3 tags.
+    - Title from TIT2
+    - Album Artist (TPE2), unless it contains 'VVAA'
+    - If VVAA in Album Artist, fallback to Artist (TPE1)
+    `file` can be a path (read with the fast frame reader) or a TagSnapshot.
+    """
+    if isinstance(file, str):
+        try:
+            frames = read_frames(file, METADATA_FRAMES)
+            if frames is not None:
+                frames = {key: "\x00".join(values) for key, values in frames.items()}
+            return _metadata_tags(file, frames)
+        except UnsupportedTag:
+            pass
+    return load_snapshot(file).metadata_tags()
+
+
 
 # --- tag from YT ---
-def tag_from_yt(filepath: str, url: str, album: str = None, album_artist: str = None, track_num: int = None):
-    info = get_yt_metadata(url)
-    id3 = ID3(filepath)
+def tag_from_yt(filepath: str, url: str, album: str = None, album_artist: str = None, track_num: int = None, info: dict = None):
+    """
+    Tag from YouTube metadata. `info` is the video's yt-dlp info (e.g. a
+    playlist entry the caller already holds); without it the URL is extracted.
+    Label, ℗ year, release date, composers and lyrics come from the description
+    via yt_description.parse_description. Works for any container
+    tag_writer.open_writer supports (.mp3, .m4a, .opus, ...).
+    """
+    info = yt_metadata_from_info(info) if info else get_yt_metadata(url)
+    writer = open_writer(filepath)
 
     artist, song = normalize_yt_title(info)
     upload_date = info.get("upload_date")  # YYYY-MM-DD
 
     # Title + Artist
-    id3.add(TIT2(encoding=3, text=song))
-    id3.add(TPE1(encoding=3, text=artist))
+    writer.set("title", song)
+    writer.set("artist", artist)
     
     # Album Artist logic
     if album_artist:
         final_album_artist = album_artist
     else:
         final_album_artist = merge_feat(artist)
-    id3.add(TPE2(encoding=3, text=final_album_artist))
+    writer.set("album_artist", final_album_artist)
 
     # Album logic
     if album:
         final_album = album
     else:
         final_album = f"{song} [Single]"
-    id3.add(TALB(encoding=3, text=final_album))
+    writer.set("album", final_album)
 
     # Track Number
     if track_num is not None:
-        id3.add(TRCK(encoding=3, text=str(track_num)))
+        writer.set("track", track_num)
 
-    # Release date (TDOR) & year (TDRC)
+    # Release date & year
     if upload_date:
-        id3.add(TDOR(encoding=3, text=f"{upload_date}"))
-        id3.add(TDRC(encoding=3, text=f"{upload_date[0:4]}"))
+        writer.set("original_date", upload_date)
+        writer.set("date", upload_date[0:4])
     # overwrite with year if present
     if "year" in info:
-        id3.add(TDRC(encoding=3, lang="eng", desc="", text=info["year"]))
+        writer.set("date", info["year"])
 
     # Save lyrics if present
     if "lyrics" in info:
-        id3.add(USLT(encoding=3, lang="eng", desc="", text=info["lyrics"]))
+        writer.set("lyrics", info["lyrics"])
 
     # Save composer if present
     if "composer" in info:
-        id3.add(TCOM(encoding=3, lang="eng", desc="", text=info["composer"]))
+        writer.set("composer", info["composer"])
 
     # Save publisher if present
     if "publisher" in info:
-        id3.add(TPUB(encoding=3, lang="eng", desc="", text=info["publisher"]))
+        writer.set("publisher", info["publisher"])
 
     # Save description if present
     if "description" in info:
-        id3.add(COMM(encoding=3, lang="eng", desc="", text=info["description"]))
+        writer.set("comment", info["description"])
 
     # Cover art
     cover_data, mime_type = fetch_and_crop_cover(info.get("thumbnails", []))
     if cover_data:
-        id3.add(APIC(
-            encoding=3,
-            mime=mime_type or "image/jpeg",
-            type=3,
-            desc="Cover",
-            data=cover_data
-        ))
+        writer.set_cover(cover_data, mime_type)
         # print("🖼️ Added cropped YouTube thumbnail as cover")
     else:
         print("⚠️ No valid thumbnail to add as cover, skipping")
 
-    id3.save(v2_version=3)
+    writer.save()
     # print(f"✅ Tagged {filepath} with YouTube metadata")
 
-def tag_mp3_with_discogs(filepath: str, release, overwrite: str = "y"):
+def fetch_discogs_cover(release):
+    """Download the release's primary image. Returns (data, mime_type), or (None, None)."""
+    try:
+        # images may be loaded lazily from the API (dump releases), so it can fail like the download
+        images = getattr(release, "images", None)
+        img_url = images[0].get("resource_url") if images else None
+        if not img_url:
+            return None, None
+        # served from cover_cache.db after the first download
+        return cover_cache.fetch(img_url)
+    except Exception as e:
+        print(f"⚠️ Could not fetch cover art: {e}")
+    return None, None
+
+def tag_mp3_with_discogs(file, release, overwrite: str = "y", cover=None):
     """
     Tag an MP3 file with Discogs metadata, cover art, URL, and catalog/ISRC.
     If overwrite='n', only writes tags that are currently missing.
+    `file` can be a path or a TagSnapshot already loaded by the caller; .m4a
+    and .opus paths get the same fields through tag_writer.
+    `cover` is an optional (data, mime_type) from fetch_discogs_cover, or a
+    callable returning one, so the tracks of one release can share a single
+    download that only happens if some file needs the cover.
     """
+    writer = open_writer(file)
+    filepath = writer.filepath
     if not release:
         print(f"⚠️ No release provided for tagging {filepath}")
         return
 
-    try:
-        id3 = ID3(filepath)
-    except Exception:
-        id3 = ID3()
-
-    def add_tag(frame_class, *args, **kwargs):
+    def add_tag(field, value):
         """Add a tag if overwriting is allowed or tag doesn't exist."""
-        frame_id = frame_class.__name__[:4]
-        if overwrite.lower() == "n" and frame_id in id3:
+        if overwrite.lower() == "n" and writer.has(field):
             # Skip if not overwriting and tag already present
             return
-        id3.add(frame_class(*args, **kwargs))
+        writer.set(field, value)
 
     try:
         # --- Core tags ---
@@ -200,26 +293,26 @@ def tag_mp3_with_discogs(filepath: str, release, overwrite: str = "y"):
             or getattr(release, "data", {}).get("released_formatted")
         )
 
-        add_tag(TPE1, encoding=3, text=artists_str)
-        add_tag(TPE2, encoding=3, text=artists_str)
-        # add_tag(TIT2, encoding=3, text=title)
-        add_tag(TALB, encoding=3, text=album)
+        add_tag("artist", artists_str)
+        add_tag("album_artist", artists_str)
+        # add_tag("title", title)
+        add_tag("album", album)
         if genres:
-            add_tag(TCON, encoding=3, text=genres[0])
+            add_tag("genre", genres[0])
         if year:
-            add_tag(TDRC, encoding=3, text=str(year))
+            add_tag("date", str(year))
         if released:
-            add_tag(TDOR, encoding=3, text=str(released))
+            add_tag("original_date", str(released))
 
         # Labels / publisher
         labels = [l.name if not isinstance(l, dict) else l.get("name", "Unknown") for l in getattr(release, "labels", [])]
         if labels:
-            add_tag(TPUB, encoding=3, desc="Publisher", text="; ".join(labels))
+            add_tag("publisher", "; ".join(labels))
 
         # Discogs URL
         discogs_url = getattr(release, "url", None)
         if discogs_url:
-            add_tag(TOAL, encoding=3, desc="DiscogsURL", text=discogs_url)
+            add_tag("discogs_url", discogs_url)
 
         # Catalog number
         catno = None
@@ -230,27 +323,22 @@ def tag_mp3_with_discogs(filepath: str, release, overwrite: str = "y"):
             else:
                 catno = getattr(label, "catno", None)
         if catno:
-            add_tag(TSRC, encoding=3, desc="CatalogNumber", text=catno)
+            add_tag("catalog", catno)
 
         # Cover art
-        existing_covers = [f for f in id3.getall("APIC") if f.data]
-        if overwrite.lower() == "n" and existing_covers:
+        if overwrite.lower() == "n" and writer.has_cover():
             print("🖼️ Skipping cover art (already present)")
-        elif hasattr(release, "images") and release.images:
-            img_url = release.images[0].get("resource_url")
-            if img_url and (overwrite.lower() == "y" or "APIC" not in id3):
-                try:
-                    headers = {"User-Agent": "Mozilla/5.0"}
-                    response = requests.get(img_url, headers=headers)
-                    if response.headers.get("content-type", "").startswith("image/"):
-                        img_data = response.content
-                        mime_type = response.headers["content-type"]
-                        add_tag(APIC, encoding=3, mime=mime_type, type=3, desc="Cover", data=img_data)
-                        print("🖼️ Added cover art")
-                except Exception as e:
-                    print(f"⚠️ Could not fetch cover art: {e}")
-
-        id3.save(filepath, v2_version=3)
+        else:
+            if cover is None:
+                cover = fetch_discogs_cover(release)
+            elif callable(cover):
+                cover = cover()
+            img_data, mime_type = cover
+            if img_data:
+                writer.set_cover(img_data, mime_type)
+                print("🖼️ Added cover art")
+
+        writer.save()
         print(f"✅ Saved tags for {filepath}")
 
     except Exception as e:
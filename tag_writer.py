@@ -0,0 +1,141 @@
+import os
+import base64
+from mutagen.id3 import APIC, TOAL, TSRC, TALB, TPE1, TPE2, TIT2, TCON, TDRC, TPUB, TDOR, COMM, TCOM, USLT, TRCK
+from mutagen.mp4 import MP4, MP4Cover, MP4FreeForm
+from mutagen.oggopus import OggOpus
+from mutagen.oggvorbis import OggVorbis
+from mutagen.flac import Picture
+
+# Fields every writer understands. ID3 keeps the frames this repo has always
+# used (the Discogs URL in TOAL, the catalog number in TSRC).
+ID3_FRAMES = {
+    "title": TIT2, "artist": TPE1, "album_artist": TPE2, "album": TALB, "track": TRCK,
+    "date": TDRC, "original_date": TDOR, "genre": TCON, "publisher": TPUB, "composer": TCOM,
+    "discogs_url": TOAL, "catalog": TSRC, "lyrics": USLT, "comment": COMM,
+}
+MP4_ATOMS = {
+    "title": "©nam", "artist": "©ART", "album_artist": "aART", "album": "©alb", "date": "©day",
+    "genre": "©gen", "composer": "©wrt", "lyrics": "©lyr", "comment": "©cmt",
+}
+# Fields without an iTunes atom go into freeform atoms, named like the Vorbis comments
+MP4_FREEFORM = "----:com.apple.iTunes:"
+VORBIS_KEYS = {
+    "title": "TITLE", "artist": "ARTIST", "album_artist": "ALBUMARTIST", "album": "ALBUM", "track": "TRACKNUMBER",
+    "date": "DATE", "original_date": "ORIGINALDATE", "genre": "GENRE", "publisher": "LABEL", "composer": "COMPOSER",
+    "discogs_url": "DISCOGS_URL", "catalog": "CATALOGNUMBER", "lyrics": "LYRICS", "comment": "COMMENT",
+}
+
+
+class ID3Writer:
+    """Fields -> ID3 frames, queued on a tag.TagSnapshot and written with its single save()."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.filepath = snapshot.filepath
+
+    def has(self, field: str) -> bool:
+        return bool(self.snapshot.id3.getall(ID3_FRAMES[field].__name__))
+
+    def set(self, field: str, value):
+        frame_class = ID3_FRAMES[field]
+        if frame_class in (USLT, COMM):
+            self.snapshot.add(frame_class(encoding=3, lang="eng", desc="", text=value))
+        else:
+            self.snapshot.add(frame_class(encoding=3, text=str(value)))
+
+    def has_cover(self) -> bool:
+        return any(f.data for f in self.snapshot.id3.getall("APIC"))
+
+    def set_cover(self, data: bytes, mime: str = None):
+        self.snapshot.add(APIC(encoding=3, mime=mime or "image/jpeg", type=3, desc="Cover", data=data))
+
+    def save(self):
+        self.snapshot.save(v2_version=3)
+
+
+class MP4Writer:
+    """Fields -> iTunes atoms (.m4a)."""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.audio = MP4(filepath)
+        if self.audio.tags is None:
+            self.audio.add_tags()
+        self.tags = self.audio.tags
+
+    def _key(self, field: str) -> str:
+        if field == "track":
+            return "trkn"
+        return MP4_ATOMS.get(field) or MP4_FREEFORM + VORBIS_KEYS[field]
+
+    def has(self, field: str) -> bool:
+        return self._key(field) in self.tags
+
+    def set(self, field: str, value):
+        key = self._key(field)
+        if field == "track":
+            self.tags[key] = [(int(value), 0)]
+        elif key.startswith(MP4_FREEFORM):
+            self.tags[key] = [MP4FreeForm(str(value).encode("utf-8"))]
+        else:
+            self.tags[key] = [str(value)]
+
+    def has_cover(self) -> bool:
+        return bool(self.tags.get("covr"))
+
+    def set_cover(self, data: bytes, mime: str = None):
+        image_format = MP4Cover.FORMAT_PNG if mime == "image/png" else MP4Cover.FORMAT_JPEG
+        self.tags["covr"] = [MP4Cover(data, imageformat=image_format)]
+
+    def save(self):
+        self.audio.save()
+
+
+class VorbisWriter:
+    """Fields -> Vorbis comments (.opus / .ogg); the cover is a METADATA_BLOCK_PICTURE."""
+
+    def __init__(self, filepath: str, audio_class):
+        self.filepath = filepath
+        self.audio = audio_class(filepath)
+        self.tags = self.audio.tags
+
+    def has(self, field: str) -> bool:
+        return VORBIS_KEYS[field] in self.tags
+
+    def set(self, field: str, value):
+        self.tags[VORBIS_KEYS[field]] = [str(value)]
+
+    def has_cover(self) -> bool:
+        return "METADATA_BLOCK_PICTURE" in self.tags
+
+    def set_cover(self, data: bytes, mime: str = None):
+        picture = Picture()
+        picture.type = 3
+        picture.mime = mime or "image/jpeg"
+        picture.desc = "Cover"
+        picture.data = data
+        self.tags["METADATA_BLOCK_PICTURE"] = [base64.b64encode(picture.write()).decode("ascii")]
+
+    def save(self):
+        self.audio.save()
+
+
+def open_writer(file):
+    """
+    A tag writer for an audio file: a path (.mp3, .m4a, .opus, .ogg) or a
+    tag.TagSnapshot already loaded by the caller. All writers share the field
+    names in VORBIS_KEYS plus set_cover()/has_cover() and save().
+    """
+    if hasattr(file, "id3"):
+        return ID3Writer(file)
+    ext = os.path.splitext(file)[1].lower()
+    if ext == ".mp3":
+        from tag import TagSnapshot
+        return ID3Writer(TagSnapshot(file))
+    if ext in (".m4a", ".mp4"):
+        return MP4Writer(file)
+    if ext == ".opus":
+        return VorbisWriter(file, OggOpus)
+    if ext == ".ogg":
+        return VorbisWriter(file, OggVorbis)
+    raise ValueError(f"No tag writer for {ext or 'extensionless'} files: {file}")
@@ -5,6 +5,8 @@ import glob
 import requests
 from PIL import Image
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cover_cache import cover_cache
 
 def clean_feat(artist: str) -> str:
     m = re.search(r"\(\s*(feat\.?|ft\.?)\s+([^)]+)\)", artist, flags=re.IGNORECASE)
@@ -160,39 +162,98 @@ def clean_title(title: str) -> str:
     return title.strip()
 
 # --- fetch & crop cover ---
+COVER_SIZE = 720
+# Thumbnails fetched at once per attempt; the first usable one wins
+HEDGE_THUMBNAILS = 2
+
+def crop_cover(img_data: bytes):
+    """Central square crop resized to COVER_SIZE. Returns (jpeg_bytes, mime_type)."""
+    img = Image.open(BytesIO(img_data))
+    w, h = img.size
+    if img.format == "JPEG":
+        # let the decoder scale by 1/2, 1/4 or 1/8 while keeping the short side >= COVER_SIZE
+        scale = max(1, min(w, h) // COVER_SIZE)
+        img.draft("RGB", (w // scale, h // scale))
+        w, h = img.size
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    side = min(w, h)
+    left = (w - side) // 2
+    top = (h - side) // 2
+    img = img.crop((left, top, left + side, top + side))
+    # cheap box reduction by whole factors first, then one resample to the exact size
+    factor = side // COVER_SIZE
+    if factor >= 2:
+        img = img.reduce(factor)
+    if img.size != (COVER_SIZE, COVER_SIZE):
+        img = img.resize((COVER_SIZE, COVER_SIZE))
+
+    out = BytesIO()
+    img.save(out, format="JPEG")
+    return out.getvalue(), "image/jpeg"
+
+def rank_thumbnails(thumbnails, size: int = COVER_SIZE) -> list:
+    """
+    Thumbnail URLs best first: the smallest declared at least size x size, then
+    ones with no declared size (in yt-dlp's best-first order), then smaller ones,
+    largest first. JPEGs win ties since they decode with draft().
+    """
+    def key(item):
+        position, thumb = item
+        w, h = thumb.get("width"), thumb.get("height")
+        webp = "webp" in thumb["url"]
+        if w and h and min(w, h) >= size:
+            return 0, w * h, webp, -position
+        if w and h:
+            return 2, -w * h, webp, -position
+        return 1, 0, webp, -position
+    candidates = [(i, t) for i, t in enumerate(thumbnails or []) if t.get("url")]
+    return [thumb["url"] for _, thumb in sorted(candidates, key=key)]
+
+def _cover(url: str, variant: str):
+    """(cover, error) for one thumbnail; cover is (data, mime) or None."""
+    try:
+        # downloaded and cropped once per image; later tracks reuse the cached result
+        img_data, mime_type = cover_cache.processed(url, variant, crop_cover)
+        return ((img_data, mime_type) if img_data else None), None
+    except requests.RequestException:
+        return None, f"⚠️ Failed to fetch thumbnail: {url}"
+    except Exception as e:
+        return None, f"⚠️ Failed to process thumbnail {url}: {e}"
+
+def _first_cover(urls: list, variant: str):
+    """Fetch urls in parallel and keep the first usable cover; losers finish in the background (and stay cached)."""
+    pool = ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix="thumb")
+    errors = []
+    try:
+        for future in as_completed([pool.submit(_cover, url, variant) for url in urls]):
+            cover, error = future.result()
+            if cover:
+                return cover
+            errors.append(error)
+    finally:
+        pool.shutdown(wait=False)
+    for error in filter(None, errors):
+        print(error)
+    return None
+
 def fetch_and_crop_cover(thumbnails):
-    if not thumbnails:
+    urls = rank_thumbnails(thumbnails)
+    if not urls:
         return None, None
 
-    for thumb in reversed(thumbnails):  # try highest quality first
-        url = thumb.get("url")
-        if not url:
-            continue
-
-        try:
-            resp = requests.get(url, timeout=5)
-            resp.raise_for_status()
-            img_data = resp.content
-            if not img_data or not isinstance(img_data, (bytes, bytearray)):
-                continue
-
-            # Central square crop
-            img = Image.open(BytesIO(img_data))
-            w, h = img.size
-            side = min(w, h)
-            left = (w - side) // 2
-            top = (h - side) // 2
-            img = img.crop((left, top, left + side, top + side))
-            img = img.resize((720, 720))
-
-            out = BytesIO()
-            img.save(out, format="JPEG")
-            return out.getvalue(), "image/jpeg"
-
-        except requests.RequestException:
-            print(f"⚠️ Failed to fetch thumbnail: {url}")
-        except Exception as e:
-            print(f"⚠️ Failed to process thumbnail {url}: {e}")
+    variant = f"square{COVER_SIZE}"
+    # an album's tracks usually share a thumbnail already cropped for an earlier track
+    for url in urls[:HEDGE_THUMBNAILS]:
+        hit = cover_cache.cached(url, variant)
+        if hit:
+            return hit
+
+    # the best candidates are raced HEDGE_THUMBNAILS at a time
+    for start in range(0, len(urls), HEDGE_THUMBNAILS):
+        cover = _first_cover(urls[start:start + HEDGE_THUMBNAILS], variant)
+        if cover:
+            return cover
 
     print("⚠️ No valid thumbnails found")
     return None, None
@@ -1,14 +1,18 @@
 import sys
-from subprocess import run
+from subprocess import run, DEVNULL
 
-def run_tagger(folder_path, overwrite, mode):
+def run_tagger(folder_path, overwrite, mode, auto_accept=None):
+    # No stdin in the web app: run in batch mode, undecided albums go to the review queue
     cmd = [
         sys.executable,
         "discogs_tagger.py",
         "--path", folder_path,
         "--overwrite", overwrite,
-        "--mode", mode
+        "--mode", mode,
+        "--batch"
     ]
+    if auto_accept is not None:
+        cmd += ["--auto-accept", str(auto_accept)]
 
-    result = run(cmd, capture_output=True, text=True)
+    result = run(cmd, capture_output=True, text=True, stdin=DEVNULL)
     return result.stdout + result.stderr
\ No newline at end of file
@@ -1,7 +1,10 @@
 from flask import Flask, render_template, request, Response, stream_with_context
 from web.web_discogs import run_tagger
 # from web.web_genius import run_genius
-from genius import genius_tagger
+from genius import genius_tagger, DEFAULT_WORKERS
+from discogs_tagger import review_queue, resolve_review, AUTO_ACCEPT
+import contextlib
+import io
 import json
 
 MUSIC_ROOT = "/data"
@@ -16,6 +19,7 @@ def home():
 def progress_stream():
     user_param = request.args.get('param')
     fullpath = f"{MUSIC_ROOT}/{user_param.strip()}"
+    workers = request.args.get('workers', DEFAULT_WORKERS, type=int)
 
     @stream_with_context
     def generate():
@@ -23,7 +27,7 @@ def progress_stream():
         current_total = 1
 
         # 1. Iterate over your existing tagger (Start msg, Files, Summary msg)
-        for step, total_steps, message in genius_tagger(fullpath):
+        for step, total_steps, message in genius_tagger(fullpath, workers):
             current_total = total_steps
             completed += step
 
@@ -59,21 +63,43 @@ def discogs_page():
     logs = ""
     overwrite = "n"
     mode = "a"
+    auto_accept = AUTO_ACCEPT
 
     if request.method == "POST":
         selected_folder = request.form["folder"]
         overwrite = request.form.get("overwrite", "n")
         mode = request.form.get("mode", "a")
+        auto_accept = request.form.get("auto_accept", AUTO_ACCEPT, type=float)
 
         full_path = f"{MUSIC_ROOT}/{selected_folder.strip()}"
 
-        logs = run_tagger(full_path, overwrite, mode)
+        logs = run_tagger(full_path, overwrite, mode, auto_accept)
 
     return render_template(
         "discogs_tagger.html",
         selected_folder=selected_folder,
         overwrite=overwrite,
         mode=mode,
+        auto_accept=auto_accept,
+        pending=len(review_queue.pending()),
+        logs=logs
+    )
+
+@app.route("/discogs_review", methods=["GET", "POST"])
+def discogs_review_page():
+    logs = ""
+    if request.method == "POST":
+        # release_id 0 means skip
+        key = request.form["key"]
+        release_id = request.form.get("release_id_custom", 0, type=int) or request.form.get("release_id", 0, type=int)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            resolve_review(key, release_id or None)
+        logs = out.getvalue()
+
+    return render_template(
+        "discogs_review.html",
+        items=review_queue.pending(),
         logs=logs
     )
 
@@ -84,6 +110,7 @@ def genius_page():
     return render_template(
         "genius_tagger.html",
         selected_folder="",
+        workers=DEFAULT_WORKERS,
         logs=""
     )
 
@@ -0,0 +1,108 @@
+import sqlite3
+import threading
+import time
+import argparse
+
+ARCHIVE_DB = "ytm2mp3_archive.db"
+# Video ids per IN (...) lookup, under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+class DownloadArchive:
+    """
+    Video id -> final file and source playlist for every track ytm2mp3 has
+    finished (downloaded, converted and tagged). Like yt-dlp's download_archive,
+    but keyed for lookups by playlist and keeping where each track ended up.
+    """
+
+    def __init__(self, db_path: str = ARCHIVE_DB):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        # opened on first use so importing the module doesn't create the file
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS downloads (
+                    video_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    playlist_id TEXT,
+                    downloaded_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS downloads_playlist ON downloads (playlist_id)")
+            self.conn.commit()
+        return self.conn
+
+    def known(self, video_ids) -> set:
+        """The subset of video_ids already in the archive (a query per LOOKUP_CHUNK ids)."""
+        ids = [v for v in video_ids if v]
+        found = set()
+        with self.lock:
+            db = self._db()
+            for start in range(0, len(ids), LOOKUP_CHUNK):
+                chunk = ids[start:start + LOOKUP_CHUNK]
+                rows = db.execute(
+                    f"SELECT video_id FROM downloads WHERE video_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def add(self, video_id: str, path: str, playlist_id: str = None):
+        with self.lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO downloads (video_id, path, playlist_id, downloaded_at) VALUES (?, ?, ?, ?)",
+                    (video_id, path, playlist_id, time.time())
+                )
+
+    def playlist(self, playlist_id: str) -> list:
+        """[(video_id, path), ...] recorded for a playlist, oldest first."""
+        with self.lock:
+            return self._db().execute(
+                "SELECT video_id, path FROM downloads WHERE playlist_id = ? ORDER BY downloaded_at", (playlist_id,)
+            ).fetchall()
+
+    def import_text(self, path: str) -> int:
+        """Load a yt-dlp download_archive file ('youtube <id>' lines); the file paths are unknown."""
+        with open(path, "r", encoding="utf-8") as f:
+            ids = [parts[1] for parts in map(str.split, f) if len(parts) == 2 and parts[0] == "youtube"]
+        now = time.time()
+        with self.lock:
+            db = self._db()
+            with db:
+                db.executemany(
+                    "INSERT OR IGNORE INTO downloads (video_id, path, playlist_id, downloaded_at) VALUES (?, '', NULL, ?)",
+                    [(video_id, now) for video_id in ids]
+                )
+        return len(ids)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+download_archive = DownloadArchive()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ytm2mp3 download archive")
+    parser.add_argument("--import", dest="import_file", type=str, help="Import a yt-dlp download_archive text file")
+    parser.add_argument("--playlist", type=str, help="List the tracks recorded for a playlist id")
+    args = parser.parse_args()
+
+    if args.import_file:
+        print(f"📥 Imported {download_archive.import_text(args.import_file)} video ids from {args.import_file}")
+    if args.playlist:
+        for video_id, path in download_archive.playlist(args.playlist):
+            print(f"{video_id}: {path}")
+    download_archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import json
+import zlib
+import sqlite3
+import threading
+import time
+import yt_dlp
+
+PLAYLIST_DB = "playlist_cache.db"
+# Extracted playlists are reused for this long (a resumed run skips the extraction)
+PLAYLIST_TTL = 12 * 60 * 60
+# Per-entry fields that are large, short-lived (stream URLs expire) and not needed for naming or tagging
+HEAVY_FIELDS = ("formats", "requested_formats", "requested_downloads", "automatic_captions",
+                "subtitles", "heatmap", "http_headers", "fragments", "storyboards")
+
+
+def slim(info: dict) -> dict:
+    """Drop HEAVY_FIELDS from a playlist info dict and its entries."""
+    info = {k: v for k, v in info.items() if k not in HEAVY_FIELDS}
+    if info.get("entries") is not None:
+        info["entries"] = [slim(entry) if entry else None for entry in info["entries"]]
+    return info
+
+
+class PlaylistCache:
+    """
+    Playlist URL -> flat yt-dlp playlist info (entries included), stored as
+    compressed JSON so later album passes and resumed runs reuse one extraction.
+    """
+
+    def __init__(self, db_path: str = PLAYLIST_DB, ttl: float = PLAYLIST_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        # opened on first use so importing the module doesn't create the file
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS playlists (
+                    url TEXT PRIMARY KEY,
+                    info BLOB NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self.conn.commit()
+        return self.conn
+
+    def get(self, url: str):
+        with self.lock:
+            row = self._db().execute("SELECT info, fetched_at FROM playlists WHERE url = ?", (url,)).fetchone()
+        if not row or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, url: str, info: dict):
+        with self.lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO playlists (url, info, fetched_at) VALUES (?, ?, ?)",
+                    (url, zlib.compress(json.dumps(info).encode()), time.time())
+                )
+
+
+playlist_cache = PlaylistCache()
+
+
+def entry_url(entry: dict):
+    """Video URL of a playlist entry, flat (url) or fully extracted (webpage_url)."""
+    return entry.get("webpage_url") or entry.get("url") if entry else None
+
+
+def load_playlist(url: str, refresh: bool = False) -> dict:
+    """
+    The playlist's info and a flat entry list (ids, titles, URLs; no per-video
+    extraction), extracted once and then served from playlist_cache.db.
+    Listing time grows with pages of the playlist, not with resolving each video.
+    """
+    if not refresh:
+        cached = playlist_cache.get(url)
+        if cached is not None:
+            return cached
+    with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True, "ignoreerrors": True, "extract_flat": "in_playlist"}) as ydl:
+        info = slim(ydl.sanitize_info(ydl.extract_info(url, download=False)))
+    playlist_cache.put(url, info)
+    return info
@@ -0,0 +1,85 @@
+import re
+
+# Compiled once; each is applied to a single line, and only when a cheap substring check says it can match
+PHONOGRAM = re.compile(r"℗\s*(\d{4})?\s*(.+)")
+PROVIDED_BY = re.compile(r"Provided to YouTube by (.+)", re.IGNORECASE)
+RELEASED_ON = re.compile(r"Released on:\s*(\d{4}-\d{2}-\d{2})", re.IGNORECASE)
+# Credit lines name one or more roles before the colon ("Composer: X", "Composer  Lyricist: X")
+COMPOSER = re.compile(r"^([^:]*\bcomposer\b[^:]*):\s*(.+)", re.IGNORECASE)
+# "lyrics" followed by ":"/"-" or the end of the line; the lyrics are everything after it
+LYRICS = re.compile(r"lyrics(?=[:\-]|$)", re.IGNORECASE)
+
+SEPARATOR = " · "
+FOOTER = "Auto-generated by YouTube."
+
+
+def _add_publisher(data: dict, publisher: str):
+    if "publisher" not in data:
+        data["publisher"] = publisher
+    elif publisher != data["publisher"]:
+        data["publisher"] = f"{data['publisher']}; {publisher}"
+
+
+def parse_description(description: str) -> dict:
+    """
+    Fields of a YouTube Music "Provided to YouTube by" description, in one pass over its lines:
+
+        Provided to YouTube by <label>          -> publisher
+        <title> · <artist> · <artist>           -> title, uploader ("artist; artist")
+        ℗ <year> <label>                        -> year, publisher
+        Released on: <YYYY-MM-DD>               -> upload_date
+        Composer: <name>  (any number of lines) -> composer ("name; name"), also
+        Composer  Lyricist: <name>                 from combined credit lines
+        Lyrics: ...                             -> lyrics (everything after the marker,
+                                                   up to the "Auto-generated" footer)
+
+    Only keys that were found are returned. When both label lines are present
+    and differ, publisher is "<℗ label>; <provided-by label>".
+    """
+    data = {}
+    phonogram = provided = lyrics = None
+    composers = []
+    # "." never matched a newline in the patterns this replaces, so lines are split on "\n" only
+    lines = (description or "").split("\n")
+
+    for n, line in enumerate(lines):
+        lower = line.lower()
+
+        if phonogram is None and "℗" in line:
+            phonogram = PHONOGRAM.search(line)
+        if provided is None and "provided to youtube by" in lower:
+            m = PROVIDED_BY.search(line)
+            provided = m.group(1).strip() if m else None
+        if "title" not in data:
+            idx = line.find(SEPARATOR, 1)
+            if idx != -1 and line[idx + len(SEPARATOR):]:
+                data["title"] = line[:idx].strip()
+                data["uploader"] = line[idx + len(SEPARATOR):].replace(SEPARATOR, "; ").strip()
+        if "upload_date" not in data and "released on:" in lower:
+            m = RELEASED_ON.search(line)
+            if m:
+                data["upload_date"] = m.group(1)
+        if "composer" in lower:
+            m = COMPOSER.search(line)
+            if m:
+                composers.append(m.group(2).strip())
+        if lyrics is None and "lyrics" in lower:
+            m = LYRICS.search(line)
+            if m:
+                # the separators after the marker may run onto the following lines; the footer isn't lyrics
+                end = next((k for k in range(n + 1, len(lines)) if lines[k].strip() == FOOTER), len(lines))
+                text = "\n".join([line[m.end():]] + lines[n + 1:end]).lstrip(":-\n").strip()
+                if text:
+                    lyrics = text
+
+    if phonogram:
+        if phonogram.group(1):
+            data["year"] = phonogram.group(1)
+        _add_publisher(data, phonogram.group(2).strip())
+    if provided is not None:
+        _add_publisher(data, provided)
+    if composers:
+        data["composer"] = "; ".join(composers)
+    if lyrics:
+        data["lyrics"] = lyrics
+    return data
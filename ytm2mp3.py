@@ -1,13 +1,32 @@
 import os
+import argparse
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import yt_dlp
-from utils import normalize_yt_title, safe_filename, clean_feat, clean_title
-from discogs import search_discogs_with_prompt
+from utils import normalize_yt_title, safe_filename, clean_feat, clean_title, strip_feat
+from discogs import search_discogs_with_prompt, discogs_candidates
 from tag import tag_mp3_with_discogs, tag_from_yt
+from yt_cache import load_playlist, entry_url
+from yt_archive import download_archive
+from http_session import host_stats
 from tqdm import tqdm
 from yaspin import yaspin
 
 OUTPUT_DIR = "downloads"
 FFMPEG_PATH = r"C:\Users\djniz\anaconda3\envs\python3_13\Library\bin"
+MP3_BITRATE = "160k"
+# Concurrent yt-dlp downloads (network bound)
+DOWNLOAD_WORKERS = 4
+# Concurrent ffmpeg transcodes (CPU bound)
+TRANSCODE_WORKERS = os.cpu_count() or 2
+# Discogs searches run ahead of the prompts (the shared rate limit still paces them)
+PREFETCH_WORKERS = 2
+# "mp3" re-encodes to MP3_BITRATE; "native" stream-copies YouTube's own audio (no re-encode)
+AUDIO_FORMAT = "mp3"
+# yt-dlp acodec prefix -> container the stream is copied into
+NATIVE_EXTENSIONS = {"opus": ".opus", "mp4a": ".m4a", "vorbis": ".ogg"}
 
 def make_progress_hook():
     pbar = None
@@ -25,10 +44,152 @@ def make_progress_hook():
                 pbar = None
     return hook
 
+# --- Download / transcode workers ---
+def ffmpeg_binary() -> str:
+    return os.path.join(FFMPEG_PATH, "ffmpeg") if os.path.isdir(FFMPEG_PATH) else "ffmpeg"
+
+def run_ffmpeg(args: list):
+    """Run ffmpeg with args; returns the CPU seconds it used (None where the OS can't report it)."""
+    proc = subprocess.Popen([ffmpeg_binary(), "-y", "-loglevel", "error", *args],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    stderr = proc.stderr.read()
+    proc.stderr.close()
+    cpu = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        cpu = usage.ru_utime + usage.ru_stime
+    else:
+        proc.wait()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.strip()}")
+    return cpu
+
+def transcode_to_mp3(src: str):
+    """ffmpeg src -> <same name>.mp3 at MP3_BITRATE, removing src. Returns (mp3 path, ffmpeg CPU seconds)."""
+    dst = os.path.splitext(src)[0] + ".mp3"
+    if src == dst:
+        return dst, 0.0
+    cpu = run_ffmpeg(["-i", src, "-vn", "-codec:a", "libmp3lame", "-b:a", MP3_BITRATE, dst])
+    os.remove(src)
+    return dst, cpu
+
+def copy_native_audio(src: str, acodec: str = None):
+    """
+    Stream-copy src's audio into the container matching its codec (.opus/.m4a/.ogg),
+    removing src. Codecs without a native container fall back to transcode_to_mp3.
+    Returns (audio path, ffmpeg CPU seconds).
+    """
+    ext = NATIVE_EXTENSIONS.get((acodec or "").split(".")[0])
+    if not ext:
+        return transcode_to_mp3(src)
+    dst = os.path.splitext(src)[0] + ext
+    if src == dst:
+        return dst, 0.0
+    cpu = run_ffmpeg(["-i", src, "-vn", "-map", "0:a:0", "-codec:a", "copy", dst])
+    os.remove(src)
+    return dst, cpu
+
+class TrackFetcher:
+    """
+    Downloads on a pool of `download_workers` threads (one YoutubeDL each);
+    every finished download is handed straight to a pool of `transcode_workers`
+    ffmpeg processes, so network and CPU work overlap. With audio_format="native"
+    the ffmpeg step is a stream copy instead of an MP3 encode.
+    fetch(url) returns a future of (full video info, future of (temp audio path, CPU seconds)):
+    the download's own extraction is what resolves a flat playlist entry.
+    """
+
+    def __init__(self, download_workers: int = DOWNLOAD_WORKERS, transcode_workers: int = TRANSCODE_WORKERS, audio_format: str = AUDIO_FORMAT):
+        self.audio_format = audio_format
+        self.ydl_opts = {
+            "update": True,
+            "format": "bestaudio/best",
+            "outtmpl": os.path.join(OUTPUT_DIR, "%(id)s.%(ext)s"),
+            "ffmpeg_location": FFMPEG_PATH,
+            "noplaylist": True,
+            "quiet": True,
+            "no_warnings": True,
+        }
+        # per-download byte progress bars only make sense one download at a time
+        if download_workers == 1:
+            self.ydl_opts["progress_hooks"] = [make_progress_hook()]
+        self.local = threading.local()
+        self.downloads = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix="download")
+        self.transcodes = ThreadPoolExecutor(max_workers=transcode_workers, thread_name_prefix="transcode")
+
+    def _download(self, video_url: str):
+        if not hasattr(self.local, "ydl"):
+            self.local.ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+        info = self.local.ydl.extract_info(video_url, download=True)
+        downloads = info.get("requested_downloads") or [{}]
+        src = downloads[0].get("filepath") or self.local.ydl.prepare_filename(info)
+        if self.audio_format == "native":
+            return info, self.transcodes.submit(copy_native_audio, src, info.get("acodec"))
+        return info, self.transcodes.submit(transcode_to_mp3, src)
+
+    def fetch(self, video_url: str):
+        return self.downloads.submit(self._download, video_url)
+
+    def close(self):
+        self.downloads.shutdown(wait=True, cancel_futures=True)
+        self.transcodes.shutdown(wait=True, cancel_futures=True)
+
+# --- Discogs prompts ---
+class DiscogsPrompter:
+    """
+    Foreground queue of Discogs prompts fed by the download loop.
+    Each queued track's proposed search starts at once on `search_workers`
+    threads, so its candidate table is usually ready when the prompt comes up;
+    chosen releases are written by a background tagger.
+    """
+
+    def __init__(self, search_workers: int = PREFETCH_WORKERS):
+        self.queue = queue.Queue()
+        self.searches = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix="discogs-search")
+        self.tagger = ThreadPoolExecutor(max_workers=1, thread_name_prefix="discogs-tag")
+        self.lock = threading.Lock()
+        self.stopped = False
+
+    def put(self, path: str, title: str):
+        """Queue a prompt for a finished track; ignored once run() has returned."""
+        with self.lock:
+            if self.stopped:
+                return
+            self.queue.put((path, title, self.searches.submit(discogs_candidates, strip_feat(title))))
+
+    def close(self):
+        """No more tracks; run() returns once the queued prompts are answered."""
+        self.queue.put(None)
+
+    def run(self):
+        """Answer prompts as tracks arrive, until close()."""
+        try:
+            while (item := self.queue.get()) is not None:
+                path, title, prefetched = item
+                try:
+                    release = search_discogs_with_prompt(title, prefetched)
+                except Exception as e:
+                    # one failed search shouldn't end prompting for the rest of the playlist
+                    print(f"⚠️ Discogs search failed for {title}: {e}")
+                    continue
+                if release:
+                    self.tagger.submit(tag_mp3_with_discogs, path, release)
+                else:
+                    print("No release selected. Skipping Discogs tagging.")
+        finally:
+            with self.lock:
+                self.stopped = True
+            self.searches.shutdown(wait=False, cancel_futures=True)
+            self.tagger.shutdown(wait=True)
+
 # --- Download Playlist ---
-def download_playlist(playlist_url: str, discogs_tagging: bool, album_title: str = None, album_artist: str = None, track_indices: list = None) -> list:
+def download_playlist(playlist_url: str, discogs_tagging: bool, album_title: str = None, album_artist: str = None, track_indices: list = None,
+                      download_workers: int = DOWNLOAD_WORKERS, transcode_workers: int = TRANSCODE_WORKERS, playlist_info: dict = None,
+                      audio_format: str = AUDIO_FORMAT, archive=None) -> list:
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     results = []
+    cpu_times = []
     i = 0
 
     # Determine subfolder
@@ -39,49 +200,56 @@ def download_playlist(playlist_url: str, discogs_tagging: bool, album_title: str
     else:
         current_output_dir = OUTPUT_DIR
 
-    # use video ID as temporary filename (avoids clashes & illegal chars)
-    ydl_opts = {
-        "update": True,
-        "format": "bestaudio/best",
-        "outtmpl": os.path.join(OUTPUT_DIR, "%(id)s.%(ext)s"),
-        "postprocessors": [{
-            "key": "FFmpegExtractAudio",
-            "preferredcodec": "mp3",
-            "preferredquality": "160"
-        }],
-        "ffmpeg_location": FFMPEG_PATH,
-        "ignoreerrors": True,
-        "noplaylist": True,
-        "quiet": True,
-        "no_warnings": True,
-        "progress_hooks": [make_progress_hook()],
-    }
-
-    with yaspin(text="🔍 Processing playlist items, if the playlist is long, this might take a while...", color="cyan") as spinner:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(playlist_url, download=False)
-            entries = info.get("entries", [])
+    # Album passes and syncs hand in the listing they already have; a plain run lists the
+    # playlist fresh (it's flat, so cheap) so tracks added since the cached listing aren't missed
+    info = playlist_info
+    if info is None:
+        with yaspin(text="🔍 Listing playlist items...", color="cyan") as spinner:
+            info = load_playlist(playlist_url, refresh=True)
             spinner.ok("✅ ")
-
-            # Filter entries based on track_indices if provided
-            if track_indices is not None:
-                entries = [entries[i] for i in track_indices if i < len(entries)]
-
-            for index, entry in enumerate(tqdm(entries, desc="Downloading videos", unit="video")):
+    entries = info.get("entries", [])
+    playlist_id = info.get("id")
+
+    # Filter entries based on track_indices if provided, keeping each one's playlist position
+    positions = list(range(len(entries)))
+    if track_indices is not None:
+        positions = [i for i in track_indices if i < len(entries)]
+        entries = [entries[i] for i in positions]
+
+    # Start every download up front (the pools bound the concurrency);
+    # results are then consumed in playlist order, so numbering and renames stay deterministic
+    fetcher = TrackFetcher(download_workers, transcode_workers, audio_format)
+    pending, started = [], set()
+    for entry in entries:
+        url = entry_url(entry)
+        # a repeated video would be written to the same temp file twice at once
+        pending.append(fetcher.fetch(url) if url and url not in started else None)
+        started.add(url)
+
+    def finish():
+        # renames and YouTube tags in playlist order; Discogs prompts are only queued from here
+        nonlocal i
+        try:
+            for index, (entry, future) in enumerate(zip(tqdm(entries, desc="Downloading videos", unit="video"), pending)):
+                if stop.is_set():
+                    # prompting ended early (error or Ctrl-C): finish the current file only
+                    break
                 if not entry:
                     print("⚠️ Skipping unavailable video (entry is None)")
                     continue
-
-                video_url = entry.get("webpage_url")
-                if not video_url:
+                if future is None:
+                    if entry_url(entry):
+                        print(f"⚠️ Skipping repeated video: {entry.get('title')}")
                     continue
 
-                # Download this entry only
+                # Wait for this entry's download and transcode; the download resolved its full metadata
                 try:
-                    ydl.download([video_url])
+                    full_info, transcode = future.result()
+                    temp_path, cpu = transcode.result()
                 except Exception as e:
                     print(f"⚠️ Failed to download {entry.get('title')}: {e}")
                     continue
+                entry = full_info
                 artist, song = normalize_yt_title(entry)
                 if not song:
                     i += 1
@@ -89,20 +257,23 @@ def download_playlist(playlist_url: str, discogs_tagging: bool, album_title: str
 
                 artist = clean_feat(artist)
 
+                # album passes number within the album; anything else (e.g. a sync) by playlist position
+                track_num = index + 1 if album_title and album_artist else positions[index] + 1
+
                 # build final polished filename
                 if album_title and album_artist:
-                    filename = f"{index + 1:02d} - {song}"
+                    filename = f"{track_num:02d} - {song}"
                 else:
                     filename = f"{artist} - {song}"
 
                 safe_title = clean_title(safe_filename(filename))
-                final_path = os.path.join(current_output_dir, f"{safe_title}.mp3")
+                ext = os.path.splitext(temp_path)[1]
+                final_path = os.path.join(current_output_dir, f"{safe_title}{ext}")
 
                 if os.path.exists(final_path):
-                    final_path = os.path.join(current_output_dir, f"{safe_title}_{entry['id']}.mp3")
-
-                # temp file path from yt-dlp
-                temp_path = os.path.join(OUTPUT_DIR, f"{entry['id']}.mp3")
+                    final_path = os.path.join(current_output_dir, f"{safe_title}_{entry['id']}{ext}")
+                if cpu is not None:
+                    cpu_times.append(cpu)
 
                 if os.path.exists(temp_path):
                     try:
@@ -110,21 +281,70 @@ def download_playlist(playlist_url: str, discogs_tagging: bool, album_title: str
                         print(f"✅ Saved: {final_path}")
 
                         # Tag with YouTube metadata
-                        tag_from_yt(final_path, entry["webpage_url"], album=album_title, album_artist=album_artist, track_num=index + 1)
-                        results.append({"title": safe_title, "file": final_path})
+                        tag_from_yt(final_path, entry["webpage_url"], album=album_title, album_artist=album_artist, track_num=track_num, info=entry)
+                        results.append({"title": safe_title, "file": final_path, "cpu": cpu})
+                        # finished tracks are recorded so a sync skips them
+                        if archive is not None:
+                            archive.add(entry["id"], final_path, playlist_id)
                     except Exception as e:
                         print(f"⚠️ Failed to process {entry.get('title')}: {e}")
-                    if discogs_tagging:
-                        release = search_discogs_with_prompt(safe_title)
-                        if release:
-                            tag_mp3_with_discogs(final_path, release)
-                        else:
-                            print("No release selected. Skipping Discogs tagging.")
+                    if prompter:
+                        prompter.put(final_path, safe_title)
                 else:
                     print(f"⚠️ File not found after download: {entry.get('title')}")
+        finally:
+            fetcher.close()
+            if prompter:
+                prompter.close()
+
+    # With Discogs tagging the ordered finish loop runs in the background and the
+    # prompts are answered here, so downloads, tagging and the person never wait on each other
+    prompter = DiscogsPrompter() if discogs_tagging else None
+    stop = threading.Event()
+    if prompter:
+        worker = threading.Thread(target=finish, name="finish", daemon=True)
+        worker.start()
+        try:
+            prompter.run()
+        finally:
+            # never leave the finish thread renaming/tagging while the process unwinds
+            stop.set()
+            worker.join()
+    else:
+        finish()
 
+    if cpu_times:
+        print(f"⏱️ ffmpeg CPU ({audio_format}): {sum(cpu_times) / len(cpu_times):.2f}s per track, "
+              f"{sum(cpu_times):.1f}s for {len(cpu_times)} tracks")
     return results
 
+def sync_playlist(playlist_url: str, discogs_tagging: bool = False, audio_format: str = AUDIO_FORMAT, archive=download_archive) -> list:
+    """
+    Fetch, convert and tag only the playlist entries not in the download archive.
+    The playlist is always listed fresh, but flat (a request per 100 entries),
+    so a long playlist with a few new tracks syncs in seconds.
+    """
+    with yaspin(text="🔍 Listing playlist items...", color="cyan") as spinner:
+        info = load_playlist(playlist_url, refresh=True)
+        spinner.ok("✅ ")
+    entries = info.get("entries") or []
+    done = archive.known(entry.get("id") for entry in entries if entry)
+    new = [i for i, entry in enumerate(entries) if entry and entry.get("id") not in done]
+    print(f"🔄 {len(new)} new of {len(entries)} tracks in {info.get('title') or playlist_url}")
+    if not new:
+        return []
+    return download_playlist(playlist_url, discogs_tagging, track_indices=new, playlist_info=info,
+                             audio_format=audio_format, archive=archive)
+
+def print_results(results: list):
+    if results:
+        print("\n✅ Finished processing playlist:")
+        for r in results:
+            print(f"  • {r['title']} → {r['file']}")
+    else:
+        print("⚠️ No tracks downloaded or processed.")
+    host_stats.report()
+
 def parse_track_selection(selection: str, max_tracks: int) -> list:
     """Parse track selection input which can be individual numbers or ranges like 1-9"""
     if not selection:
@@ -164,6 +384,15 @@ def parse_track_selection(selection: str, max_tracks: int) -> list:
     return selected_indices
 
 def main():
+    parser = argparse.ArgumentParser(description="Download YouTube playlists as tagged audio files")
+    parser.add_argument("--sync", metavar="URL", help="Download only tracks not downloaded before, without prompts (no Discogs tagging)")
+    parser.add_argument("--native", action="store_true", help="With --sync: keep the original audio (Opus/M4A) instead of MP3")
+    args = parser.parse_args()
+    if args.sync:
+        print_results(sync_playlist(args.sync.replace("music.youtube.com", "www.youtube.com"),
+                                    audio_format="native" if args.native else "mp3"))
+        return
+
     playlist_url = input("🎵 Enter the YouTube playlist URL: ").strip()
     if "music.youtube.com" in playlist_url:
         playlist_url = playlist_url.replace("music.youtube.com", "www.youtube.com")
@@ -177,23 +406,23 @@ def main():
         print("⚠️ No URL entered, exiting.")
         return
 
+    keep_native = input("🎧 Keep the original audio (Opus/M4A, no re-encode) instead of MP3? (y|N): ").strip().lower() == "y"
+    audio_format = "native" if keep_native else "mp3"
+
     is_album = input("💿 Is this an album? (y|N): ").strip().lower() == "y"
     if not is_album:
-        results = download_playlist(playlist_url, discogs_tagging)
-        if results:
-            print("\n✅ Finished processing playlist:")
-            for r in results:
-                print(f"  • {r['title']} → {r['file']}")
+        if input("🔄 Only download tracks not downloaded before (sync)? (y|N): ").strip().lower() == "y":
+            results = sync_playlist(playlist_url, discogs_tagging, audio_format)
         else:
-            print("⚠️ No tracks downloaded or processed.")
+            results = download_playlist(playlist_url, discogs_tagging, audio_format=audio_format, archive=download_archive)
+        print_results(results)
         return
 
     # First, get playlist info to show available tracks
-    with yaspin(text="🔍 Processing playlist items, if the playlist is long, this might take a while...", color="cyan") as spinner:
-        with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
-            info = ydl.extract_info(playlist_url, download=False)
-            entries = info.get("entries", [])
-            spinner.ok("✅ ")
+    with yaspin(text="🔍 Listing playlist items...", color="cyan") as spinner:
+        info = load_playlist(playlist_url)
+        entries = info.get("entries", [])
+        spinner.ok("✅ ")
 
     if not entries:
         print("⚠️ No tracks found in playlist.")
@@ -255,7 +484,8 @@ def main():
                 continue
 
         # Download selected tracks
-        results = download_playlist(playlist_url, discogs_tagging, album_title, album_artist, valid_indices)
+        results = download_playlist(playlist_url, discogs_tagging, album_title, album_artist, valid_indices, playlist_info=info,
+                                    audio_format=audio_format, archive=download_archive)
         total_results.extend(results)
         processed_indices.update(valid_indices)
 
@@ -265,12 +495,7 @@ def main():
         if more_albums != "y":
             break
 
-    if total_results:
-        print("\n✅ Finished processing playlist:")
-        for r in total_results:
-            print(f"  • {r['title']} → {r['file']}")
-    else:
-        print("⚠️ No tracks downloaded or processed.")
+    print_results(total_results)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file